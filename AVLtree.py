@@ -6,7 +6,7 @@
 # Source Title: Data Structures & Algorithms in Python
 # Source Authors: John Canning, Alan Broder, & Robert Lafore
 #################################################################
-# Additional Methods: .isBalanced(), .__isBalanced()
+# Additional Methods: .isBalanced(), .validate()
 #################################################################
 # Author of additional methods: gametechmatch
 # Course: Data Structures
@@ -16,8 +16,131 @@
 # These are balanced binary trees.
 ##################################################################
 
-from LinkStack import *
-    
+from bisect import bisect_left
+from mmap import mmap as _mmap, ACCESS_READ as _ACCESS_READ
+import os as _os
+import pickle as _pickle
+import struct as _struct
+
+# A snapshot file starts with a header of the magic bytes, the format
+# version, a flags field, and the item count. Then each item follows
+# in value order as its key and then its value. If every key and value
+# is an int that fits in 8 bytes, the fixed flag is set and the items
+# are plain pairs of 8-byte ints. Otherwise each key and value is a tag
+# byte and a payload: ints and floats take 8 bytes, strings and bytes
+# a 4-byte length and their bytes, and anything else is pickled
+#########################################################################
+_SNAPSHOT_MAGIC = b'AVLT'
+_SNAPSHOT_VERSION = 1
+_FIXED_INT64 = 1
+_HEADER = _struct.Struct('<4sHHQ')
+_INT64 = _struct.Struct('<q')
+_INT64_PAIR = _struct.Struct('<qq')   # The same size as the header
+_FLOAT64 = _struct.Struct('<d')
+_LENGTH = _struct.Struct('<I')
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _PICKLE = b'NFTifsbp'
+
+# This function tests if an item is an int that fits in 8 bytes
+#########################################################################
+def _isInt64(item):
+   return type(item) is int and -2**63 <= item < 2**63
+
+# This function appends the tagged record for one key or value to a
+# bytearray
+#########################################################################
+def _encodeItem(out, item):
+   kind = type(item)
+   if _isInt64(item):
+      out.append(_INT)
+      out += _INT64.pack(item)
+   elif kind is str:
+      data = item.encode('utf-8', 'surrogatepass')
+      out.append(_STR)
+      out += _LENGTH.pack(len(data))
+      out += data
+   elif kind is float:
+      out.append(_FLOAT)
+      out += _FLOAT64.pack(item)
+   elif item is None:
+      out.append(_NONE)
+   elif kind is bool:
+      out.append(_TRUE if item else _FALSE)
+   else:
+      if kind is bytes:
+         out.append(_BYTES)
+         data = item
+      else:
+         out.append(_PICKLE)
+         data = _pickle.dumps(item, _pickle.HIGHEST_PROTOCOL)
+      out += _LENGTH.pack(len(data))
+      out += data
+
+# This function decodes the record at offset in a buffer and returns
+# the item and the offset of the next record
+#########################################################################
+def _decodeItem(buffer, offset):
+   tag = buffer[offset]
+   offset += 1
+   if tag == _INT:
+      return _INT64.unpack_from(buffer, offset)[0], offset + 8
+   if tag == _STR or tag == _BYTES or tag == _PICKLE:
+      length = _LENGTH.unpack_from(buffer, offset)[0]
+      start = offset + 4
+      offset = start + length
+      if offset > len(buffer):
+         raise ValueError("Snapshot is truncated")
+      if tag == _STR:
+         return str(buffer[start:offset], 'utf-8', 'surrogatepass'), offset
+      if tag == _BYTES:
+         return bytes(buffer[start:offset]), offset
+      return _pickle.loads(buffer[start:offset]), offset
+   if tag == _FLOAT:
+      return _FLOAT64.unpack_from(buffer, offset)[0], offset + 8
+   if tag == _NONE:
+      return None, offset
+   if tag == _TRUE or tag == _FALSE:
+      return tag == _TRUE, offset
+   raise ValueError("Unknown record tag in snapshot: " + repr(chr(tag)))
+
+# This function is a generator of the count (key, value) pairs that
+# follow the header in a snapshot buffer. It raises ValueError if the
+# buffer is cut short or has bytes left over
+#########################################################################
+def _decodePairs(buffer, count):
+   offset = _HEADER.size
+   unpackInt = _INT64.unpack_from
+   try:
+      for i in range(count):
+
+         # Decode int records here, since they are the most common
+         if buffer[offset] == _INT:
+            key = unpackInt(buffer, offset + 1)[0]
+            offset += 9
+         else:
+            key, offset = _decodeItem(buffer, offset)
+         if buffer[offset] == _INT:
+            value = unpackInt(buffer, offset + 1)[0]
+            offset += 9
+         else:
+            value, offset = _decodeItem(buffer, offset)
+         if i == count - 1 and offset != len(buffer):
+            raise ValueError("Snapshot has data after its last item")
+         yield key, value
+   except (IndexError, _struct.error):
+      raise ValueError("Snapshot is truncated") from None
+
+# This function is a generator of the count (key, value) pairs in a
+# snapshot buffer of fixed-width int pairs
+#########################################################################
+def _decodeFixedPairs(buffer, count):
+   if len(buffer) != _INT64_PAIR.size * (count + 1):
+      raise ValueError("Snapshot size does not match its item count")
+
+   # The header is as long as a pair, so unpack it as one and skip it
+   pairs = _INT64_PAIR.iter_unpack(buffer)
+   next(pairs)
+   yield from pairs
+
 class AVLtree(object):
 
 # To preserve node integrity, node values and children links should
@@ -30,21 +153,36 @@ class AVLtree(object):
    #####################################################################
    class __Node(object):
 
+      # Slots drop the per-node __dict__. On 64-bit CPython 3.11 a node
+      # costs 88 bytes (72 for the object plus its garbage collector
+      # header) against 128 bytes with a __dict__, not counting the key
+      # and value objects themselves
+      __slots__ = ('key', 'value', 'sortKey', 'left', 'right', 'height',
+                   'size')
+
       # This constructor initializes a node by taking  a key-value pair
+      # and the sort key computed from the value
       ##################################################################
-      def __init__(self, key, value):
+      def __init__(self, key, value, sortKey):
          self.key = key
          self.value = value
+         self.sortKey = sortKey
          self.left = self.right = None # Empty child links
-         self.updateHeight() # Set initial height of node
+         self.height = self.size = 1 # A leaf is 1 level and 1 node
 
-      # This method updates the height of a node from children
+      # This method updates the height and the subtree size of a node
+      # from children
       ##################################################################
       def updateHeight(self):
-         # Get maximum child height using 0 for empty child links
-         self.height = max(child.height if child else 0
-            # Add 1 for this node
-            for child in (self.left, self.right)) + 1
+         left, right = self.left, self.right
+         # Use 0 for empty child links and add 1 for this node
+         leftHeight, leftSize = (left.height, left.size) if left else (0, 0)
+         if right:
+            self.height = max(leftHeight, right.height) + 1
+            self.size = leftSize + right.size + 1
+         else:
+            self.height = leftHeight + 1
+            self.size = leftSize + 1
 
       # This method returns the difference in child heights
       ##################################################################
@@ -59,98 +197,588 @@ class AVLtree(object):
       def __str__(self):
          return 'AVL>' + str(self.value)
      
-   # This constructor initializes an empty AVL tree
+   # This constructor initializes an empty AVL tree. Values are ordered
+   # by key(value) if a key function is given, like the key argument of
+   # sorted(). The sort key is computed once per item and kept in its
+   # node. If indexKeys is True, the tree also keeps a dictionary from
+   # each item's key to its node so items can be found by key. Keys
+   # should then be unique. If several values share a key, the index
+   # holds the latest one stored. If stats is True, the tree counts the
+   # work its searches, inserts, and deletes do (see stats())
    #####################################################################
-   def __init__(self):
+   def __init__(self, key=None, indexKeys=False, stats=False):
       self.__root = None # No root node in empty tree
+      self.__sortKey = key
+      self.__keyIndex = {} if indexKeys else None
+      self.__stats = None
+      if stats:
+         self.reset_stats()
+
+   # This method returns a snapshot of the work counters as a dictionary.
+   # Comparisons count the nodes whose sort key an operation compared,
+   # retraceSteps the nodes it walked back up through, and updateHeight
+   # the calls to that node method. The tree must have been made with
+   # stats=True
+   #####################################################################
+   def stats(self):
+      if self.__stats is None:
+         raise Exception("Tree was not made with stats=True")
+      snapshot = dict(self.__stats)
+      searches = snapshot['searches']
+      snapshot['meanSearchPathLength'] = (
+         snapshot['searchPathLength'] / searches if searches else 0.0)
+      return snapshot
+
+   # This method starts counting from zero again
+   #####################################################################
+   def reset_stats(self):
+      self.__stats = dict.fromkeys(
+         ('searches', 'inserts', 'deletes', 'comparisons', 'searchPathLength',
+          'maxSearchPathLength', 'retraceSteps', 'updateHeight', 'rotateLeft',
+          'rotateRight', 'singleRotations', 'doubleRotations', 'balanceLeft',
+          'balanceRight'), 0)
+
+   # This method counts an insert or delete that compared levels nodes
+   # on the way down and retraced steps nodes on the way back up, of
+   # which rebalances were fixed by rotation instead of updateHeight
+   #####################################################################
+   def __countWrite(self, kind, levels, steps, rebalances):
+      stats = self.__stats
+      stats[kind] += 1
+      stats['comparisons'] += levels
+      stats['retraceSteps'] += steps
+      stats['updateHeight'] += steps - rebalances
+
+   # This method counts a single or double rotation, and the balance
+   # method that made it, if any
+   #####################################################################
+   def __countRebalance(self, double, trigger=None):
+      stats = self.__stats
+      stats['doubleRotations' if double else 'singleRotations'] += 1
+      if trigger:
+         stats[trigger] += 1
 
    # This method checks if a tree is empty
    #####################################################################
    def isEmpty(self):
       return self.__root is None
 
-   # This method finds a node that matches a soughtValue value
+   # This method returns the number of items in the tree
+   #####################################################################
+   def __len__(self):
+      return self.__root.size if self.__root else 0
+
+   # This class method builds a balanced AVL tree in one linear pass
+   # from (key, value) pairs already sorted by value with no repeated
+   # values. It raises ValueError if the pairs are out of order. Any
+   # options are passed on to the constructor
    #####################################################################
-   def __find(self, soughtValue, node):
+   @classmethod
+   def from_sorted(cls, pairs, **options):
+      tree = cls(**options)
+
+      # The builder needs the item count up front
+      if not hasattr(pairs, '__len__'):
+         pairs = list(pairs)
+      tree.__root = tree.__build(tree.__checkSorted(pairs), len(pairs))
+      return tree
+
+   # This class method builds a balanced AVL tree from (key, value)
+   # pairs in any order. Unless presorted is True, the pairs are sorted
+   # by value and, like repeated inserts, the last key for a value wins
+   #####################################################################
+   @classmethod
+   def from_iterable(cls, pairs, presorted=False, **options):
+      if presorted:
+         return cls.from_sorted(pairs, **options)
+
+      # A stable sort keeps equal values in input order, so the last
+      # pair in each run of equal values is the one to keep
+      sortKey = options.get('key')
+      keyed = sorted(((pair[1] if sortKey is None else sortKey(pair[1]), pair)
+                      for pair in pairs), key=lambda keyedPair: keyedPair[0])
+      unique = []
+      previous = None
+      for keyValue, (key, value) in keyed:
+         if unique and not previous < keyValue:
+            unique[-1] = (key, value, keyValue)
+         else:
+            unique.append((key, value, keyValue))
+         previous = keyValue
+
+      # The triples are in order and each sort key was computed once, so
+      # they go straight to the builder
+      tree = cls(**options)
+      tree.__root = tree.__build(iter(unique), len(unique))
+      return tree
+
+   # This method writes the tree's items to a binary snapshot file in
+   # value order. It writes a temporary file first and then replaces
+   # path, so a crash never leaves a partly written snapshot behind.
+   # The key function is not saved, so pass the same one to load()
+   #####################################################################
+   def save(self, path):
+      fixed = all(_isInt64(key) and _isInt64(value)
+                  for key, value in self.traverse('in'))
+      path = _os.fspath(path)
+      temporary = path + '.tmp'
+      with open(temporary, 'wb') as file:
+         file.write(_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION,
+                                 _FIXED_INT64 if fixed else 0, len(self)))
+         out = bytearray()
+         for key, value in self.traverse('in'):
+            if fixed:
+               out += _INT64_PAIR.pack(key, value)
+            else:
+               _encodeItem(out, key)
+               _encodeItem(out, value)
+            if len(out) >= 1 << 20:
+               file.write(out)
+               out.clear()
+         file.write(out)
+         file.flush()
+         _os.fsync(file.fileno())
+      _os.replace(temporary, path)
+
+   # This class method builds a balanced tree from a snapshot file in
+   # one linear pass. With mmap True the file is mapped into memory
+   # and decoded in place instead of being read into a copy first. Any
+   # options are passed on to the constructor. Items that were pickled
+   # are unpickled, which can run code, so only load trusted files
+   #####################################################################
+   @classmethod
+   def load(cls, path, mmap=True, **options):
+      with open(path, 'rb') as file:
+         buffer = (_mmap(file.fileno(), 0, access=_ACCESS_READ) if mmap
+                   else file.read())
+      pairs = None
+      try:
+         if len(buffer) < _HEADER.size:
+            raise ValueError("Snapshot is truncated")
+         magic, version, flags, count = _HEADER.unpack_from(buffer)
+         if magic != _SNAPSHOT_MAGIC:
+            raise ValueError("Not an AVL tree snapshot: " + str(path))
+         if version != _SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version: " + str(version))
+         if count == 0 and len(buffer) != _HEADER.size:
+            raise ValueError("Snapshot has data after its last item")
+
+         # The count is known, so build straight from the decoded pairs
+         tree = cls(**options)
+         pairs = (_decodeFixedPairs if flags & _FIXED_INT64 else
+                  _decodePairs)(buffer, count)
+         tree.__root = tree.__build(tree.__checkSorted(pairs), count)
+         return tree
+
+      # The decoder must let go of a mapped buffer before it is closed
+      finally:
+         if pairs is not None:
+            pairs.close()
+         if mmap:
+            buffer.close()
+
+   # This method yields (key, value, sort key) triples, checking that
+   # the sort keys are strictly increasing
+   #####################################################################
+   def __checkSorted(self, pairs):
+      sortKey = self.__sortKey
+      previous = None
+      for i, (key, value) in enumerate(pairs):
+         keyValue = value if sortKey is None else sortKey(value)
+         if i and not previous < keyValue:
+            raise ValueError("Pairs are not sorted by unique value")
+         yield key, value, keyValue
+         previous = keyValue
+
+   # This method builds a perfectly balanced subtree from the next n
+   # pairs of an in-order iterator and returns its root. Putting the
+   # extra node on the left makes the height of n nodes n.bit_length()
+   #####################################################################
+   def __build(self, items, n):
+      if n == 0:
+         return None
+
+      # Build the left subtree first so the pairs are consumed in order
+      leftCount = n // 2
+      left = self.__build(items, leftCount)
+      key, value, sortKey = next(items)
+      node = self.__Node(key, value, sortKey)
+      if self.__keyIndex is not None:
+         self.__keyIndex[key] = node
+      node.left = left
+      node.right = self.__build(items, n - leftCount - 1)
+      node.height = n.bit_length()
+      node.size = n
+      return node
+
+   # This method returns the sort key of a value
+   #####################################################################
+   def __keyOf(self, value):
+      return value if self.__sortKey is None else self.__sortKey(value)
+
+   # This method finds a node whose sort key matches soughtKey
+   #####################################################################
+   def __find(self, soughtKey, node):
       while node is not None:
-         # If current node's value matches soughtValue, return the node
-         if node.value == soughtValue:
-            return node
-         # Else if soughtValue is below current node, then search left subtree
-         elif soughtValue < node.value:
+         nodeKey = node.sortKey
+         # If soughtKey is below current node, then search left subtree
+         if soughtKey < nodeKey:
             node = node.left
-         # Else search the right subtree
-         else:
+         # Else if soughtKey is above current node, search right subtree
+         elif nodeKey < soughtKey:
             node = node.right
-      # If the loop ends, soughtValue wasn't found
+         # Else current node matches soughtKey, so return the node
+         else:
+            return node
+      # If the loop ends, soughtKey wasn't found
       return None
 
+   # This method finds a node whose sort key matches soughtKey like
+   # __find(), counting the search and the length of its path
+   #####################################################################
+   def __findCounted(self, soughtKey):
+      node = self.__root
+      levels = 0
+      while node is not None:
+         levels += 1
+         nodeKey = node.sortKey
+         if soughtKey < nodeKey:
+            node = node.left
+         elif nodeKey < soughtKey:
+            node = node.right
+         else:
+            break
+      stats = self.__stats
+      stats['searches'] += 1
+      stats['comparisons'] += levels
+      stats['searchPathLength'] += levels
+      if levels > stats['maxSearchPathLength']:
+         stats['maxSearchPathLength'] = levels
+      return node
+
    # This method searches for an item whose value matches a soughtValue starting
    # at root.
    #####################################################################
    def search(self, soughtValue):
-      node = self.__find(soughtValue, self.__root)
+      if self.__stats is not None:
+         node = self.__findCounted(self.__keyOf(soughtValue))
+      else:
+         node = self.__find(self.__keyOf(soughtValue), self.__root)
       # Return the node's key, if found
       if node is not None:
          return node.key
 
-   # This method inserts an item into the AVL tree
+   # This method returns the value stored with a key, or None if no item
+   # has that key. The tree must have been made with indexKeys=True
    #####################################################################
-   def insert(self, key, value):
-      # Reset the root to be the modified tree
-      self.__root, flag = self.__insert(self.__root, key, value)
-      # Return the insert vs. update flag
-      return flag
+   def search_by_key(self, key):
+      if self.__keyIndex is None:
+         raise Exception("Tree was not made with indexKeys=True")
+      node = self.__keyIndex.get(key)
+      if node is not None:
+         return node.value
+
+   # This method removes a node's key from the key index, unless the
+   # index has since given that key to another node
+   #####################################################################
+   def __unindexKey(self, node):
+      if self.__keyIndex.get(node.key) is node:
+         del self.__keyIndex[node.key]
+
+   # This method searches for many values at once and returns their
+   # keys in the same order, with None for values not in the tree. The
+   # values are sorted and answered in one descent, so values that
+   # share a path from the root walk it only once
+   #####################################################################
+   def search_many(self, soughtValues):
+      soughtKeys = [self.__keyOf(value) for value in soughtValues]
+      order = sorted(range(len(soughtKeys)), key=soughtKeys.__getitem__)
+      ordered = [soughtKeys[i] for i in order]
+      keys = [None] * len(ordered)
+
+      # Each stack entry is a subtree and the slice of sorted values
+      # that can only be found inside it
+      stack = []
+      if ordered and self.__root is not None:
+         stack.append((self.__root, 0, len(ordered)))
+      while stack:
+         node, lo, hi = stack.pop()
+
+         # Once the slice holds a single value, its path is no longer
+         # shared, so finish it with a plain descent
+         if hi - lo == 1:
+            node = self.__find(ordered[lo], node)
+            if node is not None:
+               keys[order[lo]] = node.key
+            continue
+
+         nodeKey = node.sortKey
+
+         # Split the slice around this node's value, answering any
+         # values that match it
+         mid = end = bisect_left(ordered, nodeKey, lo, hi)
+         while end < hi and not nodeKey < ordered[end]:
+            keys[order[end]] = node.key
+            end += 1
+
+         # Send the lower values left and the higher values right
+         if lo < mid and node.left is not None:
+            stack.append((node.left, lo, mid))
+         if end < hi and node.right is not None:
+            stack.append((node.right, end, hi))
+
+      return keys
+
+   # This method returns the number of items whose value is below
+   # soughtValue, using the subtree sizes along one descent
+   #####################################################################
+   def rank(self, soughtValue):
+      soughtKey = self.__keyOf(soughtValue)
+      count = 0
+      node = self.__root
+      while node is not None:
+
+         # If this node is below soughtValue, count it and its left
+         # subtree, then look for more on the right
+         if node.sortKey < soughtKey:
+            count += node.left.size + 1 if node.left else 1
+            node = node.right
+         else:
+            node = node.left
+      return count
+
+   # This method returns the (key, value) pair of the item at position
+   # index in value order, starting from 0
+   #####################################################################
+   def select(self, index):
+
+      # Raise an exception if there is no item at that position
+      if not 0 <= index < len(self):
+         raise IndexError("Tree index out of range")
+
+      node = self.__root
+      while True:
+         leftSize = node.left.size if node.left else 0
+
+         # If the item is in the left subtree, search there
+         if index < leftSize:
+            node = node.left
+
+         # Else if this node is the item, return it
+         elif index == leftSize:
+            return (node.key, node.value)
+
+         # Else skip this node and its left subtree and search right
+         else:
+            index -= leftSize + 1
+            node = node.right
+
+   # This method returns the number of items whose value is at least
+   # lo and below hi
+   #####################################################################
+   def count_range(self, lo, hi):
+      return max(self.rank(hi) - self.rank(lo), 0)
+
+   # This method returns the (key, value) pair with the greatest value
+   # not above soughtValue, or None if there is none
+   #####################################################################
+   def floor(self, soughtValue):
+      return self.__closestBelow(soughtValue, True)
+
+   # This method returns the (key, value) pair with the greatest value
+   # below soughtValue, or None if there is none
+   #####################################################################
+   def lower(self, soughtValue):
+      return self.__closestBelow(soughtValue, False)
+
+   # This method returns the (key, value) pair with the smallest value
+   # not below soughtValue, or None if there is none
+   #####################################################################
+   def ceiling(self, soughtValue):
+      return self.__closestAbove(soughtValue, True)
+
+   # This method returns the (key, value) pair with the smallest value
+   # above soughtValue, or None if there is none
+   #####################################################################
+   def higher(self, soughtValue):
+      return self.__closestAbove(soughtValue, False)
+
+   # This method descends once, remembering the last node below
+   # soughtValue (or equal to it, if inclusive) each time it goes right
+   #####################################################################
+   def __closestBelow(self, soughtValue, inclusive):
+      soughtKey = self.__keyOf(soughtValue)
+      best = None
+      node = self.__root
+      while node is not None:
+         if node.sortKey < soughtKey:
+            best = node
+            node = node.right
+         elif inclusive and not soughtKey < node.sortKey:
+            best = node
+            break
+         else:
+            node = node.left
+      return (best.key, best.value) if best else None
+
+   # This method descends once, remembering the last node above
+   # soughtValue (or equal to it, if inclusive) each time it goes left
+   #####################################################################
+   def __closestAbove(self, soughtValue, inclusive):
+      soughtKey = self.__keyOf(soughtValue)
+      best = None
+      node = self.__root
+      while node is not None:
+         if soughtKey < node.sortKey:
+            best = node
+            node = node.left
+         elif inclusive and not node.sortKey < soughtKey:
+            best = node
+            break
+         else:
+            node = node.right
+      return (best.key, best.value) if best else None
 
-   # This method inserts an item into the AVL subtree
+   # This method returns the (key, value) pair with the smallest value
    #####################################################################
-   def __insert(self, node, key, value):
-      # If the subtree is empty, return a new node in the tree
+   def min(self):
+
+      # If the tree is empty, raise exception
+      if self.isEmpty():
+         raise Exception("No minimum node in empty tree")
+
+      # Else follow left links from the root to the end
+      node = self.__root
+      while node.left:
+         node = node.left
+      return (node.key, node.value)
+
+   # This method returns the (key, value) pair with the largest value
+   #####################################################################
+   def max(self):
+
+      # If the tree is empty, raise exception
+      if self.isEmpty():
+         raise Exception("No maximum node in empty tree")
+
+      # Else follow right links from the root to the end
+      node = self.__root
+      while node.right:
+         node = node.right
+      return (node.key, node.value)
+
+   # This method inserts an item into the AVL tree. It walks down from
+   # the root recording the path, then rebalances on the way back up
+   # and stops as soon as a subtree keeps its old height
+   #####################################################################
+   def insert(self, key, value):
+      sortKey = value if self.__sortKey is None else self.__sortKey(value)
+      node = self.__root
+
+      # If the tree is empty, the new node becomes the root
       if node is None:
-         return self.__Node(key, value), True
+         self.__root = self.__Node(key, value, sortKey)
+         if self.__keyIndex is not None:
+            self.__keyIndex[key] = self.__root
+         if self.__stats is not None:
+            self.__countWrite('inserts', 0, 0, 0)
+         return True
+
+      # Descend to the insert point, remembering each node on the way
+      path = []
+      while node is not None:
+         path.append(node)
+         nodeKey = node.sortKey
+         if sortKey < nodeKey:
+            node = node.left
+         elif nodeKey < sortKey:
+            node = node.right
+
+         # If node already has the insert value, then update it with the
+         # new key and return False for flag
+         else:
+            if self.__keyIndex is not None:
+               self.__unindexKey(node)
+               self.__keyIndex[key] = node
+            node.key = key
+            if self.__stats is not None:
+               self.__countWrite('inserts', len(path), 0, 0)
+            return False
 
-      # If node already has the insert value, then update it with the new
-      # key
-      if value == node.value:
-         node.key = key
-         # Return the node and False for flag
-         return node, False
+      # Link a new leaf under the last node on the path
+      parent = path[-1]
+      node = self.__Node(key, value, sortKey)
+      if sortKey < parent.sortKey:
+         parent.left = node
+      else:
+         parent.right = node
+      if self.__keyIndex is not None:
+         self.__keyIndex[key] = node
 
-      # If the value belongs in the left subtree, insert on the left and
-      # update the left link
-      elif value < node.value:
-         node.left, flag = self.__insert(node.left, key, value)
+      # Walk back up the path correcting heights and balance
+      rebalances = 0
+      for i in range(len(path) - 1, -1, -1):
+         node = path[i]
+         diff = node.heightDiff()
 
          # If insert made node left heavy
-         if node.heightDiff() > 1:
+         if diff > 1:
 
             # If inside grandchild inserted, then raise grandchild
-            if node.left.value < value:
+            double = node.left.sortKey < sortKey
+            if double:
                node.left = self.rotateLeft(node.left)
 
             # Correct left heavy tree by rotating right around node
-            node = self.rotateRight(node)
-          
-      # Else, value belongs in the right subtree
-      else:
-         # Insert it on the right and update the right link
-         node.right, flag = self.__insert(node.right, key, value)
+            top = self.rotateRight(node)
 
          # If insert made node right heavy
-         if node.heightDiff() < -1:
+         elif diff < -1:
 
             # If inside grandchild inserted, then raise grandchild
-            if value < node.right.value:
+            double = sortKey < node.right.sortKey
+            if double:
                node.right = self.rotateRight(node.right)
 
-            # Correct right heavy tree by rotating left around this
-            # node
-            node = self.rotateLeft(node)
+            # Correct right heavy tree by rotating left around node
+            top = self.rotateLeft(node)
 
-      # Update this node's height and return the updated node &
-      # insert flag
-      node.updateHeight()
-      return node, flag
+         # Else the node is still balanced, so only its height can
+         # change. If it didn't, no ancestor can change either
+         else:
+            height = node.height
+            node.updateHeight()
+            if node.height == height:
+               break
+            continue
+
+         # A rotation restores the subtree's height from before the
+         # insert, so relink the raised node and stop
+         self.__relink(path, i, node, top)
+         rebalances = 1
+         if self.__stats is not None:
+            self.__countRebalance(double)
+         break
+
+      # The nodes above where the walk stopped only gain one item
+      for node in path[:i]:
+         node.size += 1
+      if self.__stats is not None:
+         self.__countWrite('inserts', len(path), len(path) - i, rebalances)
+
+      # Return True for flag because a new node was inserted
+      return True
+
+   # This method replaces the node at position i of a descent path
+   # with a new subtree top in its parent (or at the root)
+   #####################################################################
+   def __relink(self, path, i, node, top):
+      if i == 0:
+         self.__root = top
+      elif path[i - 1].left is node:
+         path[i - 1].left = top
+      else:
+         path[i - 1].right = top
 
    # This method rotates a subtree to the right
    #####################################################################
@@ -166,6 +794,9 @@ class AVLtree(object):
       # Then the heights must be updated
       top.updateHeight()
       toRaise.updateHeight()
+      if self.__stats is not None:
+         self.__stats['rotateRight'] += 1
+         self.__stats['updateHeight'] += 2
 
       # Return raised node to update parent
       return toRaise
@@ -185,12 +816,108 @@ class AVLtree(object):
 
       # The heights must be updated
       toRaise.updateHeight()
+      if self.__stats is not None:
+         self.__stats['rotateLeft'] += 1
+         self.__stats['updateHeight'] += 2
 
       # Return raised node to update parent
       return toRaise
 
-   # This method traverses a tree in pre, in, or post order.It is a
-   # non-recursive generator
+   # This method returns a new tree with the items of both trees. Where
+   # both have a value, the key from this tree is kept
+   #####################################################################
+   def union(self, other):
+      return self.__combine(other, True, True, lambda mine, theirs: mine)
+
+   # This method returns a new tree with the items of this tree whose
+   # values are also in the other tree
+   #####################################################################
+   def intersection(self, other):
+      return self.__combine(other, False, False, lambda mine, theirs: mine)
+
+   # This method returns a new tree with the items of this tree whose
+   # values are not in the other tree
+   #####################################################################
+   def difference(self, other):
+      return self.__combine(other, True, False, None)
+
+   # This method returns a new tree with the items of both trees. Where
+   # both have a value, the other tree's item wins. If on_conflict is
+   # given, that value is kept under the key on_conflict(thisKey,
+   # otherKey) instead. With a key function the two values may differ,
+   # and it is always the other tree's value that is kept
+   #####################################################################
+   def merge(self, other, on_conflict=None):
+      if on_conflict is None:
+         return self.__combine(other, True, True,
+                               lambda mine, theirs: theirs)
+      return self.__combine(
+         other, True, True, lambda mine, theirs:
+         (on_conflict(mine[0], theirs[0]), theirs[1], theirs[2]))
+
+   # This method walks both trees' nodes in value order together and
+   # builds a balanced tree from the items it keeps, in O(n + m) time.
+   # Items only in this tree or only in the other are kept if the flags
+   # say so. For a value in both, keepBoth gets the two (key, value,
+   # sort key) triples and returns the one to keep, or it is None to
+   # keep neither. The new tree has this tree's options
+   #####################################################################
+   def __combine(self, other, keepMine, keepTheirs, keepBoth):
+      if not isinstance(other, AVLtree):
+         raise TypeError("Can only combine an AVL tree with another")
+      if other.__sortKey is not self.__sortKey:
+         raise ValueError("Trees must use the same key function")
+
+      triples = []
+      add = triples.append
+      mine, theirs = self.__nodes(), other.__nodes()
+      a, b = next(mine, None), next(theirs, None)
+      while a is not None and b is not None:
+         if a.sortKey < b.sortKey:
+            if keepMine:
+               add((a.key, a.value, a.sortKey))
+            a = next(mine, None)
+         elif b.sortKey < a.sortKey:
+            if keepTheirs:
+               add((b.key, b.value, b.sortKey))
+            b = next(theirs, None)
+         else:
+            if keepBoth is not None:
+               add(keepBoth((a.key, a.value, a.sortKey),
+                            (b.key, b.value, b.sortKey)))
+            a, b = next(mine, None), next(theirs, None)
+
+      # Once one tree runs out, the rest of the other needs no compares
+      if keepMine and a is not None:
+         add((a.key, a.value, a.sortKey))
+         triples.extend((node.key, node.value, node.sortKey) for node in mine)
+      if keepTheirs and b is not None:
+         add((b.key, b.value, b.sortKey))
+         triples.extend((node.key, node.value, node.sortKey)
+                        for node in theirs)
+
+      tree = type(self)(key=self.__sortKey,
+                        indexKeys=self.__keyIndex is not None,
+                        stats=self.__stats is not None)
+      tree.__root = tree.__build(iter(triples), len(triples))
+      return tree
+
+   # This method is a generator of the tree's nodes in value order
+   #####################################################################
+   def __nodes(self):
+      stack = []
+      node = self.__root
+      while stack or node is not None:
+         while node is not None:
+            stack.append(node)
+            node = node.left
+         node = stack.pop()
+         yield node
+         node = node.right
+
+   # This method traverses a tree in pre, in, or post order. It is a
+   # non-recursive generator that keeps the pending nodes on a plain
+   # list, so it allocates nothing per node but the pairs it yields
    #####################################################################
    def traverse(self, traverseType='in'):
       # Verify traversal type is an accepted value & raise exception if
@@ -198,41 +925,105 @@ class AVLtree(object):
       if traverseType not in ['pre', 'in', 'post']:
          raise ValueError("Unknown traversal type: " + str(traverseType))
 
-      # Create a stack and put root node in stack
-      stack = Stack()
-      stack.push(self.__root)
-
-      # While there is work in the stack
-      while not stack.isEmpty():
-
-         # Get the next item
-         item = stack.pop()
-
-         # If it's a tree node
-         if isinstance(item, self.__Node):
-
-            # For post-order, put it last
-            if traverseType == 'post':
-               stack.push((item.key, item.value))
-
-            # Traverse right child
-            stack.push(item.right)
-
-            # For in-order, put item 2nd
-            if traverseType == 'in':
-               stack.push((item.key, item.value))
-
-            # Traverse left child
-            stack.push(item.left)
+      stack = []
+      node = self.__root
+
+      # For in-order, go left as far as possible, then yield a node and
+      # continue with its right subtree
+      if traverseType == 'in':
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.left
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.right
 
-            # For pre-order, put item 1st
-            if traverseType == 'pre':
-               stack.push((item.key, item.value))
+      # For pre-order, yield each node before stacking its children so
+      # the left child comes off the stack first
+      elif traverseType == 'pre':
+         if node is not None:
+            stack.append(node)
+         while stack:
+            node = stack.pop()
+            yield (node.key, node.value)
+            if node.right is not None:
+               stack.append(node.right)
+            if node.left is not None:
+               stack.append(node.left)
+
+      # For post-order, go left as far as possible, then yield a node
+      # only once its right subtree has been yielded
+      else:
+         last = None
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.left
+            node = stack[-1]
+            if node.right is not None and node.right is not last:
+               node = node.right
+            else:
+               stack.pop()
+               yield (node.key, node.value)
+               last = node
+               node = None
+
+   # This method is a generator of the (key, value) pairs whose values
+   # lie between lo and hi, in value order or in reverse. Either bound
+   # may be None, and inclusive says whether each bound is included.
+   # It descends straight to the first pair and then walks forward,
+   # so it only visits the pairs it yields plus one path
+   #####################################################################
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      loInclusive, hiInclusive = inclusive
+      if lo is not None:
+         lo = self.__keyOf(lo)
+      if hi is not None:
+         hi = self.__keyOf(hi)
+      stack = []
+      node = self.__root
+
+      # In forward order, stack the path of nodes not below lo, then
+      # yield them, stacking the left spine of each right subtree
+      if not reverse:
+         while node is not None:
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               node = node.right
+            else:
+               stack.append(node)
+               node = node.left
+         while stack:
+            node = stack.pop()
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               return
+            yield (node.key, node.value)
+            node = node.right
+            while node is not None:
+               stack.append(node)
+               node = node.left
 
-         # Every other non-None item is a (key, value) pair to be
-         # yielded
-         elif item:
-            yield item
+      # In reverse order, do the mirror image starting from hi
+      else:
+         while node is not None:
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               node = node.left
+            else:
+               stack.append(node)
+               node = node.right
+         while stack:
+            node = stack.pop()
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               return
+            yield (node.key, node.value)
+            node = node.left
+            while node is not None:
+               stack.append(node)
+               node = node.right
 
    # This method prints a tree sideways with 1 node on each line,
    # indents each level by some blanks, and starts at the root node
@@ -264,83 +1055,92 @@ class AVLtree(object):
       return '{{{}}}'.format(', '.join('{}: {}'.format(repr(key), repr(value))
                    for key, value in self.traverse('pre')))
 
-   # This method deletes a node whose value matches a given soughtValue
+   # This method deletes a node whose value matches a given soughtValue.
+   # It walks down recording the path, unlinks the node, and then
+   # rebalances on the way back up until a subtree keeps its height
    #####################################################################
    def delete(self, soughtValue):
-      # Delete starting at root and update root link
-      self.__root, flag = self.__delete(self.__root, soughtValue)
-      # Return flag indicating soughtValue node found
-      return flag
-
-   # This method deletes a soughtValue value from a subtree rooted at a node &
-   # return the modified node.
-   #####################################################################
-   def __delete(self, node, soughtValue):
-      # If subtree is empty, then return None and false
-      if node is None:
-         return None, False
-
-      # If node to delete is in left subtree, delete from left,
-      # update the left link, and store the flag
-      if soughtValue < node.value:
-         node.left, flag = self.__delete(node.left, soughtValue)
-
-         # Correct any imbalance
-         node = self.__balanceLeft(node)
-
-      # If the node to delete is in the right subtree, then delete
-      # from the right, update the right link, and store the flag
-      elif soughtValue > node.value:   # Is node to delete in right subtree?
-         node.right, flag = self.__delete(node.right, soughtValue)
-
-         # Correct any imbalance
-         node = self.__balanceRight(node)
-            
-      # Else node's value matches soughtValue, so determine deletion case
-      # If no left child, return right child as remainder, flag
-      # deletion
-      elif node.left is None:
-         return node.right, True
-      # If no right child, return left child as remainder,
-      # flagging deletion
-      elif node.right is None:
-         return node.left, True
-      # Deleted node has two children so find successor in right
-      # subtree and replace this item
-      else:
-         node.key, node.value, node.right= self.__deleteMin(node.right)
-
-         # Correct any imbalance
-         node = self.__balanceRight(node)
-
-         # The soughtValue was found and deleted
-         flag = True
-
-      # Update height of node after deletion
-      node.updateHeight()
-      # Return modified node and delete flag
-      return node, flag
-
-   # This method finds the min node of a subtree, deletes it, returns
-   # the min value, returns the key value pair and updated link to parent
-   #####################################################################
-   def __deleteMin(self, node):
-
-      # If left child link is empty, then
-      if node.left is None:
-         # this node is minimum and its right subtree, if any,
-         # replaces it
-         return (node.key, node.value, node.right)
+      soughtKey = self.__keyOf(soughtValue)
+      node = self.__root
+      path = []
 
-      # Else, delete minimum from left subtree
-      key, value, node.left = self.__deleteMin(node.left)
+      # Descend to the node holding soughtValue
+      while node is not None:
+         nodeKey = node.sortKey
+         if soughtKey < nodeKey:
+            path.append(node)
+            node = node.left
+         elif nodeKey < soughtKey:
+            path.append(node)
+            node = node.right
+         else:
+            break
 
-      # Correct any imbalance
-      node = self.__balanceLeft(node)
+      # If the subtree ran out, soughtValue is not in the tree
+      if node is None:
+         if self.__stats is not None:
+            self.__countWrite('deletes', len(path), 0, 0)
+         return False
+      levels = len(path) + 1
+      if self.__keyIndex is not None:
+         self.__unindexKey(node)
 
-      # Update height of node
-      node.updateHeight()
-      return (key, value, node)
+      # Deleted node has two children so find successor in right
+      # subtree, move its item here, and remove the successor instead
+      if node.left is not None and node.right is not None:
+         path.append(node)
+         successor = node.right
+         while successor.left is not None:
+            path.append(successor)
+            successor = successor.left
+         node.key, node.value = successor.key, successor.value
+         node.sortKey = successor.sortKey
+         if self.__keyIndex is not None:
+            self.__keyIndex[node.key] = node
+         node = successor
+
+      # The removed node has at most one child, which replaces it
+      self.__relink(path, len(path), node,
+                    node.right if node.left is None else node.left)
+
+      # Walk back up the path correcting heights and balance
+      i = len(path)
+      rebalances = 0
+      while i > 0:
+         i -= 1
+         node = path[i]
+         height = node.height
+         diff = node.heightDiff()
+
+         # Correct any imbalance the deletion left behind
+         if diff < -1:
+            top = self.__balanceLeft(node)
+         elif diff > 1:
+            top = self.__balanceRight(node)
+
+         # Else only the height can change. If it didn't, no ancestor
+         # can change either
+         else:
+            node.updateHeight()
+            if node.height == height:
+               break
+            continue
+
+         # Relink the raised node, and stop if the rotation kept the
+         # subtree's height
+         self.__relink(path, i, node, top)
+         rebalances += 1
+         if top.height == height:
+            break
+
+      # The nodes above where the walk stopped only lose one item
+      for node in path[:i]:
+         node.size -= 1
+      if self.__stats is not None:
+         self.__countWrite('deletes', levels, len(path) - i, rebalances)
+
+      # Return True for flag because soughtValue was found and deleted
+      return True
 
    # This method rebalances after left deletion
    #####################################################################
@@ -351,11 +1151,14 @@ class AVLtree(object):
 
          # If the right child is left heavy, then rotate it to the
          # right first
-         if node.right.heightDiff() > 0:
+         double = node.right.heightDiff() > 0
+         if double:
             node.right = self.rotateRight(node.right)
 
          # Correct right heavy tree by rotating left around this node
          node = self.rotateLeft(node)
+         if self.__stats is not None:
+            self.__countRebalance(double, 'balanceLeft')
 
       # Return top node
       return node
@@ -369,43 +1172,81 @@ class AVLtree(object):
 
          # If the left child is right heavy, then rotate it to the left
          # first
-         if node.left.heightDiff() < 0:
+         double = node.left.heightDiff() < 0
+         if double:
             node.left = self.rotateLeft(node.left)
 
          # Correct left heavy tree by rotating right around this node
          node = self.rotateRight(node)
+         if self.__stats is not None:
+            self.__countRebalance(double, 'balanceRight')
 
       # Return top node
       return node
 
-   # This method uses the private __isBalanced() method to check
-   # verify that an entire AVL tree is balanced based on height
+   # This method checks that an entire AVL tree is balanced based on
+   # the actual heights of its subtrees
    #####################################################################
    def isBalanced(self):
-      if self.isEmpty():
-         return True
-
-      return self.__isBalanced(self.__root)
+      return self.validate()['balanced']
 
-   # This method recursively goes through an AVL tree and checks that
-   # each node is balanced based on height
+   # This method checks the tree's invariants in one iterative
+   # post-order pass without printing anything: every node is AVL
+   # balanced, stores its true height and subtree size, and has sort
+   # keys in BST order. It returns a report dictionary whose flags say which
+   # checks passed and whose errors list holds (problem, value) pairs
    #####################################################################
-   def __isBalanced(self, node):
-      print(f"node: {node}")
-      if node:
-         print(f"node height difference: {node.heightDiff}")
-         if abs(node.heightDiff()) > 1:
-            return False
-
-         # Recursively traverse the left subtree
-         for childKey, childValue in self.__isBalanced(node.leftChild):
-            yield (childKey, childValue)  # yielding its nodes
-
-         # Yield the current node's (subtree's root node) key and value
-         yield (node.key, node.value)
-
-         # Recursively traverse right subtree
-         for childKey, childValue in self.__isBalanced(node.rightChild):
-            yield (childKey, childValue)  # yielding its nodes
-
-      return True
+   def validate(self):
+      report = {'valid': True, 'balanced': True, 'heightsCorrect': True,
+                'sizesCorrect': True, 'ordered': True,
+                'nodes': 0, 'height': 0, 'errors': []}
+      errors = report['errors']
+
+      # Each finished subtree leaves its true height, size, and smallest
+      # and largest sort keys on the results stack
+      results = []
+      stack = [(self.__root, False)]
+      while stack:
+         node, childrenDone = stack.pop()
+
+         # An empty subtree has height and size 0 and no values
+         if node is None:
+            results.append((0, 0, None, None))
+
+         # On the first visit, come back to the node after both of its
+         # subtrees, left first
+         elif not childrenDone:
+            stack.append((node, True))
+            stack.append((node.right, False))
+            stack.append((node.left, False))
+
+         # Else both subtree results are on top of the results stack
+         else:
+            rightHeight, rightSize, rightMin, rightMax = results.pop()
+            leftHeight, leftSize, leftMin, leftMax = results.pop()
+            value, nodeKey = node.value, node.sortKey
+            height = max(leftHeight, rightHeight) + 1
+            size = leftSize + rightSize + 1
+
+            if abs(leftHeight - rightHeight) > 1:
+               report['balanced'] = False
+               errors.append(('unbalanced', value))
+            if node.height != height:
+               report['heightsCorrect'] = False
+               errors.append(('height', value))
+            if node.size != size:
+               report['sizesCorrect'] = False
+               errors.append(('size', value))
+            if (leftSize and not leftMax < nodeKey or
+                rightSize and not nodeKey < rightMin):
+               report['ordered'] = False
+               errors.append(('order', value))
+
+            results.append((height, size,
+                            leftMin if leftSize else nodeKey,
+                            rightMax if rightSize else nodeKey))
+
+      # The root's result describes the whole tree
+      report['height'], report['nodes'] = results[0][:2]
+      report['valid'] = not errors
+      return report
@@ -0,0 +1,383 @@
+#################################################################
+# AVLtreeArray.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This file implements an AVL tree whose nodes live in parallel
+# arrays instead of node objects. A node is an integer index into
+# the key, value, left, right, and height arrays, and deleted
+# slots are kept on a free list for reuse. It has the same
+# insert, search, delete, and traverse methods as AVLtree.
+#################################################################
+
+from array import array
+
+class ArrayAVLtree(object):
+
+   # This constructor initializes an empty AVL tree. Slot 0 is a nil
+   # node of height 0 that stands for every empty child link, so child
+   # heights can be read without testing for empty links
+   #####################################################################
+   def __init__(self):
+      self.__keys = [None]
+      self.__values = [None]
+      self.__left = array('i', [0])
+      self.__right = array('i', [0])
+      self.__height = array('B', [0])
+      self.__root = 0  # No root node in empty tree
+      self.__free = 0  # First free slot, chained through left links
+      self.__count = 0
+
+   # This method checks if a tree is empty
+   #####################################################################
+   def isEmpty(self):
+      return self.__root == 0
+
+   # This method returns the number of items in the tree
+   #####################################################################
+   def __len__(self):
+      return self.__count
+
+   # This method returns a copy of the tree. The link and height arrays
+   # are copied as flat blocks of memory
+   #####################################################################
+   def copy(self):
+      tree = ArrayAVLtree()
+      tree.__keys = self.__keys[:]
+      tree.__values = self.__values[:]
+      tree.__left = self.__left[:]
+      tree.__right = self.__right[:]
+      tree.__height = self.__height[:]
+      tree.__root = self.__root
+      tree.__free = self.__free
+      tree.__count = self.__count
+      return tree
+
+   # This method returns a slot for a new leaf node, reusing a free
+   # slot when there is one
+   #####################################################################
+   def __newNode(self, key, value):
+      node = self.__free
+
+      # If there is a free slot, unchain it and fill it in
+      if node:
+         self.__free = self.__left[node]
+         self.__keys[node] = key
+         self.__values[node] = value
+         self.__left[node] = self.__right[node] = 0
+         self.__height[node] = 1
+
+      # Else add a new slot at the end of every array
+      else:
+         node = len(self.__keys)
+         self.__keys.append(key)
+         self.__values.append(value)
+         self.__left.append(0)
+         self.__right.append(0)
+         self.__height.append(1)
+
+      self.__count += 1
+      return node
+
+   # This method puts a removed node's slot on the free list and drops
+   # its references to the key and value
+   #####################################################################
+   def __freeNode(self, node):
+      self.__keys[node] = self.__values[node] = None
+      self.__left[node] = self.__free
+      self.__free = node
+      self.__count -= 1
+
+   # This method updates the height of a node from children
+   #####################################################################
+   def updateHeight(self, node):
+      height = self.__height
+      height[node] = max(height[self.__left[node]],
+                         height[self.__right[node]]) + 1
+
+   # This method returns the difference in child heights
+   #####################################################################
+   def heightDiff(self, node):
+      height = self.__height
+      return height[self.__left[node]] - height[self.__right[node]]
+
+   # This method finds a node that matches a soughtValue value and
+   # returns 0 if there is none
+   #####################################################################
+   def __find(self, soughtValue):
+      values, left, right = self.__values, self.__left, self.__right
+      node = self.__root
+      while node:
+         value = values[node]
+         # If current node's value matches soughtValue, return the node
+         if value == soughtValue:
+            return node
+         # Else search the subtree on soughtValue's side
+         node = left[node] if soughtValue < value else right[node]
+      return 0
+
+   # This method searches for an item whose value matches a soughtValue
+   # and returns its key
+   #####################################################################
+   def search(self, soughtValue):
+      node = self.__find(soughtValue)
+      # Return the node's key, if found
+      if node:
+         return self.__keys[node]
+
+   # This method inserts an item into the AVL tree and returns True, or
+   # updates the key of an existing value and returns False
+   #####################################################################
+   def insert(self, key, value):
+      values, left, right = self.__values, self.__left, self.__right
+      node = self.__root
+
+      # If the tree is empty, the new node becomes the root
+      if not node:
+         self.__root = self.__newNode(key, value)
+         return True
+
+      # Descend to the insert point, remembering each node on the way
+      path = []
+      while node:
+
+         # If node already has the insert value, then update its key
+         if value == values[node]:
+            self.__keys[node] = key
+            return False
+         path.append(node)
+         node = left[node] if value < values[node] else right[node]
+
+      # Link a new leaf under the last node on the path
+      parent = path[-1]
+      if value < values[parent]:
+         left[parent] = self.__newNode(key, value)
+      else:
+         right[parent] = self.__newNode(key, value)
+
+      # Walk back up the path correcting heights and balance
+      height = self.__height
+      for i in range(len(path) - 1, -1, -1):
+         node = path[i]
+         diff = height[left[node]] - height[right[node]]
+
+         # If insert made node left heavy, raise an inside grandchild
+         # first and then rotate right around node
+         if diff > 1:
+            if values[left[node]] < value:
+               left[node] = self.rotateLeft(left[node])
+            top = self.rotateRight(node)
+
+         # If insert made node right heavy, do the mirror image
+         elif diff < -1:
+            if value < values[right[node]]:
+               right[node] = self.rotateRight(right[node])
+            top = self.rotateLeft(node)
+
+         # Else only the height can change. If it didn't, no ancestor
+         # can change either
+         else:
+            old = height[node]
+            self.updateHeight(node)
+            if height[node] == old:
+               break
+            continue
+
+         # A rotation restores the subtree's old height, so relink the
+         # raised node and stop
+         self.__relink(path, i, node, top)
+         break
+
+      return True
+
+   # This method replaces the node at position i of a descent path
+   # with a new subtree top in its parent (or at the root)
+   #####################################################################
+   def __relink(self, path, i, node, top):
+      if i == 0:
+         self.__root = top
+      elif self.__left[path[i - 1]] == node:
+         self.__left[path[i - 1]] = top
+      else:
+         self.__right[path[i - 1]] = top
+
+   # This method rotates a subtree to the right and returns the raised
+   # node
+   #####################################################################
+   def rotateRight(self, top):
+      left, right = self.__left, self.__right
+      toRaise = left[top]
+      left[top] = right[toRaise]
+      right[toRaise] = top
+      self.updateHeight(top)
+      self.updateHeight(toRaise)
+      return toRaise
+
+   # This method rotates a subtree to the left and returns the raised
+   # node
+   #####################################################################
+   def rotateLeft(self, top):
+      left, right = self.__left, self.__right
+      toRaise = right[top]
+      right[top] = left[toRaise]
+      left[toRaise] = top
+      self.updateHeight(top)
+      self.updateHeight(toRaise)
+      return toRaise
+
+   # This method deletes the item whose value matches soughtValue and
+   # returns whether it was found
+   #####################################################################
+   def delete(self, soughtValue):
+      values, left, right = self.__values, self.__left, self.__right
+      node = self.__root
+      path = []
+
+      # Descend to the node holding soughtValue
+      while node:
+         if soughtValue < values[node]:
+            path.append(node)
+            node = left[node]
+         elif soughtValue > values[node]:
+            path.append(node)
+            node = right[node]
+         else:
+            break
+
+      # If the subtree ran out, soughtValue is not in the tree
+      if not node:
+         return False
+
+      # Deleted node has two children so move its successor's item here
+      # and remove the successor's slot instead
+      if left[node] and right[node]:
+         path.append(node)
+         successor = right[node]
+         while left[successor]:
+            path.append(successor)
+            successor = left[successor]
+         self.__keys[node] = self.__keys[successor]
+         values[node] = values[successor]
+         node = successor
+
+      # The removed node has at most one child, which replaces it
+      self.__relink(path, len(path), node, left[node] or right[node])
+      self.__freeNode(node)
+
+      # Walk back up the path correcting heights and balance
+      height = self.__height
+      for i in range(len(path) - 1, -1, -1):
+         node = path[i]
+         old = height[node]
+         diff = height[left[node]] - height[right[node]]
+
+         # If node is right heavy, rotate a left heavy right child first
+         # and then rotate left around node
+         if diff < -1:
+            if self.heightDiff(right[node]) > 0:
+               right[node] = self.rotateRight(right[node])
+            top = self.rotateLeft(node)
+
+         # If node is left heavy, do the mirror image
+         elif diff > 1:
+            if self.heightDiff(left[node]) < 0:
+               left[node] = self.rotateLeft(left[node])
+            top = self.rotateRight(node)
+
+         # Else only the height can change. If it didn't, no ancestor
+         # can change either
+         else:
+            self.updateHeight(node)
+            if height[node] == old:
+               break
+            continue
+
+         # Relink the raised node, and stop if the rotation kept the
+         # subtree's height
+         self.__relink(path, i, node, top)
+         if height[top] == old:
+            break
+
+      return True
+
+   # This method traverses the tree in pre, in, or post order. It is a
+   # non-recursive generator of (key, value) pairs
+   #####################################################################
+   def traverse(self, traverseType='in'):
+      # Verify traversal type is an accepted value & raise exception if
+      # not
+      if traverseType not in ['pre', 'in', 'post']:
+         raise ValueError("Unknown traversal type: " + str(traverseType))
+
+      keys, values = self.__keys, self.__values
+      left, right = self.__left, self.__right
+      stack = []
+      node = self.__root
+
+      # For in-order, go left as far as possible, then yield a node and
+      # continue with its right subtree
+      if traverseType == 'in':
+         while stack or node:
+            while node:
+               stack.append(node)
+               node = left[node]
+            node = stack.pop()
+            yield keys[node], values[node]
+            node = right[node]
+
+      # For pre-order, yield each node before pushing its children so
+      # the left child comes off the stack first
+      elif traverseType == 'pre':
+         if node:
+            stack.append(node)
+         while stack:
+            node = stack.pop()
+            yield keys[node], values[node]
+            if right[node]:
+               stack.append(right[node])
+            if left[node]:
+               stack.append(left[node])
+
+      # For post-order, yield a node once its right subtree is done
+      else:
+         last = 0
+         while stack or node:
+            while node:
+               stack.append(node)
+               node = left[node]
+            node = stack[-1]
+            if right[node] and right[node] != last:
+               node = right[node]
+            else:
+               stack.pop()
+               yield keys[node], values[node]
+               last = node
+               node = 0
+
+   # This method prints a tree sideways with 1 node on each line,
+   # indents each level by some blanks, and starts at the root node
+   # with no indent
+   #####################################################################
+   def print(self, indentBy=7):
+      self.__pTree(self.__root, "", indentBy)
+
+   # This method recursively prints a subtree sideways, increasing the
+   # indent level for subtrees
+   #####################################################################
+   def __pTree(self, node, indent, indentBy=7):
+
+      # Only print if there is a node
+      if node:
+         self.__pTree(self.__right[node], indent + " " * indentBy, indentBy)
+         print(indent, 'AVL>' + str(self.__values[node]),
+               '(', self.__height[node], self.heightDiff(node), ')')
+         self.__pTree(self.__left[node], indent + " " * indentBy, indentBy)
+
+   # This method shows the tree in string form as key-value pairs
+   # surrounded in curly braces
+   #####################################################################
+   def __str__(self):
+      return '{{{}}}'.format(', '.join('{}: {}'.format(repr(key), repr(value))
+                   for key, value in self.traverse('pre')))
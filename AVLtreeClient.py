@@ -18,8 +18,10 @@
 
 from BinarySearchTree import *
 from AVLtree import *
-import sys
+from concurrent.futures import ProcessPoolExecutor
 import itertools
+import os
+import sys
 
 def main():
    print("#########################################################################")
@@ -45,88 +47,128 @@ def main():
    print("Check balance of empty tree after removing values:")
    checkBalance(myAVLtree)
 
-   # Find all the permutations of a list and turn it into a 2D list
-   # The permutationList will be used to test binary search trees
-   # and AVL trees
+   # Sweep all the permutations of a list, building a binary search
+   # tree and an AVL tree from each one
    moreValues = [1, 2, 3, 4, 5, 6]
-   permutationsOfMoreValues = permutations(moreValues)
-   permutationList = list(permutationsOfMoreValues)
+   sweep = sweepPermutations(moreValues, keep=True)
 
    print("#########################################################################")
    print("################ PERMUTATIONS OF A BINARY SEARCH TREE ###################")
    print("#########################################################################")
-   # Check each permutation if it would create a balanced binary search tree based
-   # on the difference in levels for each node
-   currentTree = BinarySearchTree()
-   allBalancedOptions = []
-   finalInsertIndex = 0
-
-   # check each permutation
-   for item in permutationList:
-      treeInsertIndex = 0
-
-      # fill a tree with all the values in the current permutation
-      for i in item:
-         currentTree.insert(treeInsertIndex, i)
-         treeInsertIndex += 1
-
-      # insert the permutation in the list of balanced permutations if it creates
-      # a balanced binary search tree
-      if currentTree.balanceTrueOrFalse():
-         allBalancedOptions.insert(finalInsertIndex, item)
-         finalInsertIndex +=1
-
-      # Clear the binary search tree to check the next permutation
-      for i in item:
-         currentTree.delete(i)
-
    # print all permutations that would yield a balanced binary search tree
    print("All permutations that would yield a balanced Binary Search Tree:")
-   for i in allBalancedOptions:
+   for i in sweep['balancedBSTPermutations']:
       print(i)
 
    # print the number of permutations that would yield a balanced binary
    # search tree
-   print(f"Total Balanced Binary Search Tree Permutations: {len(allBalancedOptions)}")
-   print(f"Total Permutations in all: {len(permutationList)}")
+   print(f"Total Balanced Binary Search Tree Permutations: {sweep['balancedBST']}")
+   print(f"Total Permutations in all: {sweep['total']}")
 
    print("#########################################################################")
    print("#################### PERMUTATIONS OF AN AVL TREE ########################")
    print("#########################################################################")
-   # Check each permutation if it would create an unbalanced AVL tree based
-   # on the difference in levels for each node
-   testAVLtree = AVLtree()
-   allUnbalancedOptions = []
-   finalInsertIndex = 0
-
-   # check each permutation
-   for item in permutationList:
-      treeInsertIndex = 0
-
-      # fill AVL tree with all the values in the current permutation
-      for i in item:
-         testAVLtree.insert(treeInsertIndex, i)
-         treeInsertIndex += 1
-
-      # insert the permutation in the list of unbalanced permutations if it creates
-      # an unbalanced AVL tree
-      if not testAVLtree.isBalanced():
-         allUnbalancedOptions.insert(finalInsertIndex, item)
-         finalInsertIndex += 1
-
-      # Clear the AVL tree to check the next permutation
-      for i in item:
-         testAVLtree.delete(i)
-
    # print all permutations that would yield an unbalanced AVL tree
    print("All permutations that would not yield a balanced AVL tree:")
-   for i in allUnbalancedOptions:
+   for i in sweep['unbalancedAVLPermutations']:
       print(i)
 
    # print the number of permutations that would yield an unbalanced AVL
    # tree
-   print(f"Total Unbalanced AVL Tree Permutations: {len(allUnbalancedOptions)}")
-   print(f"Total Permutations in all: {len(permutationList)}")
+   print(f"Total Unbalanced AVL Tree Permutations: {sweep['unbalancedAVL']}")
+   print(f"Total Permutations in all: {sweep['total']}")
+
+# This function sweeps every permutation of a list of values. For each
+# one it builds a binary search tree and an AVL tree, and it counts the
+# balanced binary search trees and the unbalanced AVL trees. The work is
+# split into shards by permutation prefix and spread over a process pool
+# of workers (default one per core; 1 runs in this process). If keep is
+# True the matching permutations are returned too, in the order
+# itertools.permutations gives them
+#########################################################################
+def sweepPermutations(values, workers=None, keep=False):
+   values = tuple(values)
+   if workers is None:
+      workers = os.cpu_count() or 1
+
+   # Use prefixes just long enough to give each worker several shards,
+   # so the shards balance out across the pool
+   prefixLength = 0
+   shardCount = 1
+   while prefixLength < len(values) - 1 and shardCount < 4 * workers:
+      shardCount *= len(values) - prefixLength
+      prefixLength += 1
+
+   # Permute positions rather than values, so a repeated value is only
+   # taken out of the rest once per place it fills in the prefix
+   positions = range(len(values))
+   shards = [(tuple(values[i] for i in prefix),
+              tuple(values[i] for i in positions if i not in prefix), keep)
+             for prefix in itertools.permutations(positions, prefixLength)]
+
+   if workers == 1:
+      results = map(sweepShard, shards)
+   else:
+      pool = ProcessPoolExecutor(max_workers=workers)
+      results = pool.map(sweepShard, shards,
+                         chunksize=max(1, len(shards) // (4 * workers)))
+
+   # Add up the shard results in shard order
+   sweep = {'total': 0, 'balancedBST': 0, 'unbalancedAVL': 0,
+            'balancedBSTPermutations': [] if keep else None,
+            'unbalancedAVLPermutations': [] if keep else None}
+   try:
+      for total, balancedBST, unbalancedAVL in results:
+         sweep['total'] += total
+         if keep:
+            sweep['balancedBSTPermutations'].extend(balancedBST)
+            sweep['unbalancedAVLPermutations'].extend(unbalancedAVL)
+            balancedBST, unbalancedAVL = len(balancedBST), len(unbalancedAVL)
+         sweep['balancedBST'] += balancedBST
+         sweep['unbalancedAVL'] += unbalancedAVL
+   finally:
+      if workers != 1:
+         pool.shutdown()
+   return sweep
+
+# This function sweeps the permutations that start with a prefix and
+# continue with some order of the rest of the values. It streams them
+# without making a list and builds fresh trees for each one. It returns
+# the number of permutations, then the balanced binary search trees
+# and the unbalanced AVL trees, as lists of permutations if keep is
+# True and as counts if not
+#########################################################################
+def sweepShard(shard):
+   prefix, rest, keep = shard
+   total = 0
+   balancedBST = [] if keep else 0
+   unbalancedAVL = [] if keep else 0
+
+   for ending in itertools.permutations(rest):
+      item = prefix + ending
+      total += 1
+
+      # fill a new tree of each kind with the values in the permutation
+      currentTree = BinarySearchTree()
+      testAVLtree = AVLtree()
+      for treeInsertIndex, i in enumerate(item):
+         currentTree.insert(treeInsertIndex, i)
+         testAVLtree.insert(treeInsertIndex, i)
+
+      # count the permutation if it creates a balanced binary search tree
+      # or an unbalanced AVL tree
+      if currentTree.balanceTrueOrFalse():
+         if keep:
+            balancedBST.append(item)
+         else:
+            balancedBST += 1
+      if not testAVLtree.isBalanced():
+         if keep:
+            unbalancedAVL.append(item)
+         else:
+            unbalancedAVL += 1
+
+   return total, balancedBST, unbalancedAVL
 
 # This function returns all the permutations of a given list
 #########################################################################
@@ -196,6 +238,19 @@ def checkBalance(tree):
    else:
       print("Not balanced")
 
-# execute main function
+# This function sweeps the permutations of 1 to n and prints the counts
+#########################################################################
+def sweepMain(n, workers=None):
+   sweep = sweepPermutations(range(1, n + 1), workers)
+   print(f"Total Balanced Binary Search Tree Permutations: {sweep['balancedBST']}")
+   print(f"Total Unbalanced AVL Tree Permutations: {sweep['unbalancedAVL']}")
+   print(f"Total Permutations in all: {sweep['total']}")
+
+# execute main function, or just the sweep when run as
+#    python AVLtreeClient.py --sweep n [workers]
 if __name__ == '__main__':
-	main()
+	if len(sys.argv) > 2 and sys.argv[1] == '--sweep':
+		sweepMain(int(sys.argv[2]),
+		          int(sys.argv[3]) if len(sys.argv) > 3 else None)
+	else:
+		main()
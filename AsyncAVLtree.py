@@ -0,0 +1,142 @@
+#################################################################
+# AsyncAVLtree.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This file lets an asyncio program use a large AVL tree without
+# blocking its event loop. Traversals and batch changes give the
+# loop a turn every few hundred nodes, and bulk builds can run in
+# an executor. Lookups take O(log n) time, so they stay ordinary
+# method calls.
+#################################################################
+
+from AVLtree import *
+from functools import partial
+import asyncio
+
+# A wrapper around an AVL tree for use from coroutines. Every change
+# made through the wrapper bumps a version number, and a traversal
+# raises RuntimeError if the version moves while it is paused.
+# Changes made straight to the wrapped tree are not seen
+#################################################################
+class AsyncAVLtree(object):
+
+   # This constructor wraps a tree, or a new empty tree made with the
+   # given options. yieldEvery is how many nodes a traversal or batch
+   # handles before giving the event loop a turn
+   #################################################################
+   def __init__(self, tree=None, yieldEvery=256, **options):
+      self.__tree = AVLtree(**options) if tree is None else tree
+      self.__yieldEvery = yieldEvery
+      self.__version = 0
+
+   # This class method builds a tree from (key, value) pairs, like
+   # AVLtree.from_iterable(), in an executor so the event loop keeps
+   # running. The executor must run in this process, so None picks the
+   # loop's default thread pool
+   #################################################################
+   @classmethod
+   async def from_iterable(cls, pairs, presorted=False, executor=None,
+                           yieldEvery=256, **options):
+      loop = asyncio.get_running_loop()
+      tree = await loop.run_in_executor(
+         executor, partial(AVLtree.from_iterable, pairs, presorted, **options))
+      return cls(tree, yieldEvery)
+
+   # This method returns the wrapped tree
+   #################################################################
+   def tree(self):
+      return self.__tree
+
+   # These methods look up items in the tree without yielding
+   #################################################################
+   def isEmpty(self):
+      return self.__tree.isEmpty()
+
+   def __len__(self):
+      return len(self.__tree)
+
+   def search(self, soughtValue):
+      return self.__tree.search(soughtValue)
+
+   # This method inserts one item, returning True for a new value and
+   # False for an updated key
+   #################################################################
+   def insert(self, key, value):
+      self.__version += 1
+      return self.__tree.insert(key, value)
+
+   # This method deletes the item with a value, returning whether it
+   # was found
+   #################################################################
+   def delete(self, soughtValue):
+      self.__version += 1
+      return self.__tree.delete(soughtValue)
+
+   # This coroutine inserts (key, value) pairs, giving the event loop a
+   # turn every yieldEvery pairs. It returns the number of new values
+   #################################################################
+   async def insert_many(self, pairs):
+      insert = self.__tree.insert
+      added = 0
+      for i, (key, value) in enumerate(pairs, 1):
+         self.__version += 1
+         if insert(key, value):
+            added += 1
+         if i % self.__yieldEvery == 0:
+            await asyncio.sleep(0)
+      return added
+
+   # This coroutine deletes the items with the given values, giving the
+   # event loop a turn every yieldEvery values. It returns the number
+   # of items deleted
+   #################################################################
+   async def delete_many(self, soughtValues):
+      delete = self.__tree.delete
+      deleted = 0
+      for i, value in enumerate(soughtValues, 1):
+         self.__version += 1
+         if delete(value):
+            deleted += 1
+         if i % self.__yieldEvery == 0:
+            await asyncio.sleep(0)
+      return deleted
+
+   # This method traverses the tree in pre, in, or post order for use
+   # with async for, giving the event loop a turn every yieldEvery nodes
+   #################################################################
+   def traverse(self, traverseType='in'):
+      return self.__cooperate(self.__tree.traverse(traverseType))
+
+   # This method is an async generator of the (key, value) pairs with
+   # values between lo and hi, like AVLtree.items()
+   #################################################################
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      return self.__cooperate(self.__tree.items(lo, hi, inclusive, reverse))
+
+   # This method is an async generator that passes on the pairs from an
+   # iterator over the tree. Other coroutines may run whenever it
+   # yields, so it checks the version before each step and raises
+   # RuntimeError if the tree has changed. It reads one pair ahead, so
+   # it returns as soon as the last pair is taken, without another turn
+   # or check
+   #################################################################
+   async def __cooperate(self, iterator):
+      version = self.__version
+      count = 0
+      done = object()
+      pair = next(iterator, done)
+      while pair is not done:
+         following = next(iterator, done)
+         yield pair
+         if following is done:
+            return
+         count += 1
+         if count == self.__yieldEvery:
+            count = 0
+            await asyncio.sleep(0)
+         if self.__version != version:
+            raise RuntimeError("Tree changed during iteration")
+         pair = following
@@ -6,9 +6,8 @@
 # Source Title: Data Structures & Algorithms in Python
 # Source Authors: John Canning, Alan Broder, & Robert Lafore
 #################################################################
-# Additional Methods: .levelBalance(), .__allUnbalancedNodesByLevels(),
-# .nodeBalance(), .__allUnbalancedNodesByNodes(),
-# .__balanceCheckTraverse(), .unbalancedNodes()
+# Additional Methods: .levelBalance(), .nodeBalance(),
+# .__unbalancedNodes(), .unbalancedNodes(), .balanceTrueOrFalse()
 #################################################################
 # Author of Additional Methods: gametechmatch
 # Course: Data Structures
@@ -17,18 +16,26 @@
 # Implement binary search trees using Tree and Node classes.
 # Nodes contain a key and a value.
 #################################################################
-from LinkStack import *
+from bisect import bisect_left
 class BinarySearchTree(object):
 
    # Node class
    #################################################################
    class __Node(object):
 
-      # Constructor that initializes a binary search tree node
+      # Slots drop the per-node __dict__. On 64-bit CPython 3.11 a node
+      # costs 72 bytes (56 for the object plus its garbage collector
+      # header) against 112 bytes with a __dict__, not counting the key
+      # and value objects themselves
+      __slots__ = ('key', 'value', 'sortKey', 'leftChild', 'rightChild')
+
+      # Constructor that initializes a binary search tree node with the
+      # sort key computed from its value
       #################################################################
-      def __init__(self, key, value, left=None, right=None):
+      def __init__(self, key, value, sortKey, left=None, right=None):
          self.key = key
          self.value = value
+         self.sortKey = sortKey
          self.leftChild = left
          self.rightChild = right
 
@@ -38,16 +45,26 @@ class BinarySearchTree(object):
       def __str__(self):
          return "{" + str(self.key) + ", " + str(self.value) + "}"
 
-   # This method initializes a binary search tree
+   # This method initializes a binary search tree. Values are ordered
+   # by key(value) if a key function is given, like the key argument of
+   # sorted(). The sort key is computed once per item and kept in its
+   # node
    #################################################################
-   def __init__(self):
+   def __init__(self, key=None):
       self.__root = None # Starts as empty
+      self.__count = 0   # Number of nodes in the tree
+      self.__sortKey = key
 
    # This method checks if the binary search tree is empty
    #################################################################
    def isEmpty(self):
       return self.__root is None
 
+   # This method returns the number of nodes in the tree
+   #################################################################
+   def __len__(self):
+      return self.__count
+
    # This method returns a root's key and value if the tree is not
    # empty
    #################################################################
@@ -61,30 +78,34 @@ class BinarySearchTree(object):
       return (self.__root.key, self.__root.value)
 
 ##################################################################################################
-   # This method finds an internal node whose value matches the
-   # value sought
+   # This method returns the sort key of a value
    #################################################################
-   def __findNodeByValue(self, soughtValue):
+   def __keyOf(self, value):
+      return value if self.__sortKey is None else self.__sortKey(value)
+
+   # This method finds an internal node whose value's sort key matches
+   # the key sought
+   #################################################################
+   def __findNodeByValue(self, soughtKey):
       current = self.__root
       parent = self
 
-      # While there is a tree left to explore and current value
-      # isn't the goal
-      while (current and soughtValue != current.value):
-         #print(f"self: {self}")
-         #print(f"self.__root: {self.__root}")
-         #print(f"current: {current}")
-         #print(f"current.value: {current.value}")
-         #print(f"soughtValue: {soughtValue}")
-
-         # Prepare to move one level down
-         parent = current
+      # While there is a tree left to explore
+      while current is not None:
+         nodeKey = current.sortKey
 
          # Advance current to left subtree when goal is less than
-         # current value, else right
-         current = (current.leftChild if soughtValue < current.value else
-            current.rightChild)
-               
+         # current value, to the right subtree when it is greater,
+         # and stop when it is neither
+         if soughtKey < nodeKey:
+            parent = current
+            current = current.leftChild
+         elif nodeKey < soughtKey:
+            parent = current
+            current = current.rightChild
+         else:
+            break
+
       # If the loop ended on a node, it must have the goal value
       # Return the node or None and parent
       return (current, parent)
@@ -92,16 +113,68 @@ class BinarySearchTree(object):
    # This method searches for a given value
    #################################################################
    def search(self, soughtValue):
-      node, parent = self.__findNodeByValue(soughtValue)
+      node, parent = self.__findNodeByValue(self.__keyOf(soughtValue))
       return node.key if node else None
 
+   # This method searches for many values at once and returns their
+   # keys in the same order, with None for values not in the tree. The
+   # values are sorted and answered in one descent, so values that
+   # share a path from the root walk it only once
+   #################################################################
+   def search_many(self, soughtValues):
+      soughtKeys = [self.__keyOf(value) for value in soughtValues]
+      order = sorted(range(len(soughtKeys)), key=soughtKeys.__getitem__)
+      ordered = [soughtKeys[i] for i in order]
+      keys = [None] * len(ordered)
+
+      # Each stack entry is a subtree and the slice of sorted values
+      # that can only be found inside it
+      stack = []
+      if ordered and self.__root is not None:
+         stack.append((self.__root, 0, len(ordered)))
+      while stack:
+         node, lo, hi = stack.pop()
+
+         # Once the slice holds a single value, its path is no longer
+         # shared, so finish it with a plain descent
+         if hi - lo == 1:
+            soughtKey = ordered[lo]
+            while node is not None:
+               nodeKey = node.sortKey
+               if soughtKey < nodeKey:
+                  node = node.leftChild
+               elif nodeKey < soughtKey:
+                  node = node.rightChild
+               else:
+                  keys[order[lo]] = node.key
+                  break
+            continue
+
+         nodeKey = node.sortKey
+
+         # Split the slice around this node's value, answering any
+         # values that match it
+         mid = end = bisect_left(ordered, nodeKey, lo, hi)
+         while end < hi and not nodeKey < ordered[end]:
+            keys[order[end]] = node.key
+            end += 1
+
+         # Send the lower values left and the higher values right
+         if lo < mid and node.leftChild is not None:
+            stack.append((node.leftChild, lo, mid))
+         if end < hi and node.rightChild is not None:
+            stack.append((node.rightChild, end, hi))
+
+      return keys
+
 ##################################################################################################
    # Insert a new node in a binary search tree
    #################################################################
    def insert(self, key, value):
+      sortKey = self.__keyOf(value)
 
       # Find the parent node
-      node, parent = self.__findNodeByValue(value)
+      node, parent = self.__findNodeByValue(sortKey)
 
       # If we find a node the same value, then return False to
       # show that nothing was inserted
@@ -112,20 +185,21 @@ class BinarySearchTree(object):
       # If the tree is empty, insert a new node at the root of the
       # tree
       if parent is self:
-         self.__root = self.__Node(key, value)
+         self.__root = self.__Node(key, value, sortKey)
 
       # Else if the new value is less than the parent node's value,
       # insert the new value (now new node) as a left child of the
       # parent
-      elif value < parent.value:
-         parent.leftChild = self.__Node(key, value, right=node)
+      elif sortKey < parent.sortKey:
+         parent.leftChild = self.__Node(key, value, sortKey, right=node)
 
       # Else, insert the new value (now new node) as right child
       # of parent node
       else:
-         parent.rightChild = self.__Node(key, value, right=node)
+         parent.rightChild = self.__Node(key, value, sortKey, right=node)
 
-      # Return true to confirm that value was inserted
+      # Count the new node and return true to confirm that value was inserted
+      self.__count += 1
       return True
 
    # This method visit all nodes of the tree in-order and prints each
@@ -188,7 +262,9 @@ class BinarySearchTree(object):
          yield (node.key, node.value)
 
    # This method is a non-recursive generator that traverses the tree
-   # in pre, in, or post order (default is in-order)
+   # in pre, in, or post order (default is in-order). It keeps the
+   # pending nodes on a plain list, so it allocates nothing per node
+   # but the pairs it yields and works at any tree depth
    #################################################################
    def traverse(self, traverseType='in'):
 
@@ -196,40 +272,105 @@ class BinarySearchTree(object):
       if traverseType not in ['pre', 'in', 'post']:
          raise ValueError("Unknown traversal type: " + str(traverseType))
 
-      # Create a stack and put the root node in the stack
-      stack = Stack()
-      stack.push(self.__root)
-
-      # While the stack isn't empty, get the next item.
-      while not stack.isEmpty():
-         item = stack.pop()
-
-         # If it is a tree node, put it in its proper location based
-         # on the traversal type
-         if isinstance(item, self.__Node): # If it's a tree node
-
-            # For post-order, put it last
-            if traverseType == 'post':
-               stack.push((item.key, item.value))
-
-            # Traverse right child
-            stack.push(item.rightChild)
-
-            # For pre-order, put item 2nd
-            if traverseType == 'in':
-               stack.push((item.key, item.value))
-
-            # Traverse left child
-            stack.push(item.leftChild)
+      stack = []
+      node = self.__root
 
-            # For pre-order, put item 1st
-            if traverseType == 'pre':
-               stack.push((item.key, item.value))
+      # For in-order, go left as far as possible, then yield a node and
+      # continue with its right subtree
+      if traverseType == 'in':
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.leftChild
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.rightChild
+
+      # For pre-order, yield each node before stacking its children so
+      # the left child comes off the stack first
+      elif traverseType == 'pre':
+         if node is not None:
+            stack.append(node)
+         while stack:
+            node = stack.pop()
+            yield (node.key, node.value)
+            if node.rightChild is not None:
+               stack.append(node.rightChild)
+            if node.leftChild is not None:
+               stack.append(node.leftChild)
+
+      # For post-order, go left as far as possible, then yield a node
+      # only once its right subtree has been yielded
+      else:
+         last = None
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.leftChild
+            node = stack[-1]
+            if node.rightChild is not None and node.rightChild is not last:
+               node = node.rightChild
+            else:
+               stack.pop()
+               yield (node.key, node.value)
+               last = node
+               node = None
+
+   # This method is a generator of the (key, value) pairs whose values
+   # lie between lo and hi, in value order or in reverse. Either bound
+   # may be None, and inclusive says whether each bound is included.
+   # It descends straight to the first pair and then walks forward,
+   # so it only visits the pairs it yields plus one path
+   #################################################################
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      loInclusive, hiInclusive = inclusive
+      if lo is not None:
+         lo = self.__keyOf(lo)
+      if hi is not None:
+         hi = self.__keyOf(hi)
+      stack = []
+      node = self.__root
 
-         # Every other non-None item has its value and key
-         # yielded
-         elif item:
-            yield item
+      # In forward order, stack the path of nodes not below lo, then
+      # yield them, stacking the left spine of each right subtree
+      if not reverse:
+         while node is not None:
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               node = node.rightChild
+            else:
+               stack.append(node)
+               node = node.leftChild
+         while stack:
+            node = stack.pop()
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               return
+            yield (node.key, node.value)
+            node = node.rightChild
+            while node is not None:
+               stack.append(node)
+               node = node.leftChild
+
+      # In reverse order, do the mirror image starting from hi
+      else:
+         while node is not None:
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               node = node.leftChild
+            else:
+               stack.append(node)
+               node = node.rightChild
+         while stack:
+            node = stack.pop()
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               return
+            yield (node.key, node.value)
+            node = node.leftChild
+            while node is not None:
+               stack.append(node)
+               node = node.rightChild
 
    # This method finds the leftmost node and returns its value and key
    #################################################################
@@ -266,6 +407,75 @@ class BinarySearchTree(object):
       # return the value and key
       return (node.key, node.value)
 
+   # This method returns the (key, value) pair with the greatest value
+   # not above soughtValue, or None if there is none
+   #################################################################
+   def floor(self, soughtValue):
+      return self.__closestBelow(soughtValue, True)
+
+   # This method returns the (key, value) pair with the greatest value
+   # below soughtValue, or None if there is none
+   #################################################################
+   def lower(self, soughtValue):
+      return self.__closestBelow(soughtValue, False)
+
+   # This method returns the (key, value) pair with the smallest value
+   # not below soughtValue, or None if there is none
+   #################################################################
+   def ceiling(self, soughtValue):
+      return self.__closestAbove(soughtValue, True)
+
+   # This method returns the (key, value) pair with the smallest value
+   # above soughtValue, or None if there is none
+   #################################################################
+   def higher(self, soughtValue):
+      return self.__closestAbove(soughtValue, False)
+
+   # This method descends once, remembering the last node below
+   # soughtValue (or equal to it, if inclusive) each time it goes right
+   #################################################################
+   def __closestBelow(self, soughtValue, inclusive):
+      soughtKey = self.__keyOf(soughtValue)
+      best = None
+      node = self.__root
+      while node is not None:
+         if node.sortKey < soughtKey:
+            best = node
+            node = node.rightChild
+         elif inclusive and not soughtKey < node.sortKey:
+            best = node
+            break
+         else:
+            node = node.leftChild
+      return (best.key, best.value) if best else None
+
+   # This method descends once, remembering the last node above
+   # soughtValue (or equal to it, if inclusive) each time it goes left
+   #################################################################
+   def __closestAbove(self, soughtValue, inclusive):
+      soughtKey = self.__keyOf(soughtValue)
+      best = None
+      node = self.__root
+      while node is not None:
+         if soughtKey < node.sortKey:
+            best = node
+            node = node.leftChild
+         elif inclusive and not node.sortKey < soughtKey:
+            best = node
+            break
+         else:
+            node = node.rightChild
+      return (best.key, best.value) if best else None
+
+   # These methods return the (key, value) pairs with the smallest and
+   # largest values, matching the AVL tree's names
+   #################################################################
+   def min(self):
+      return self.minNode()
+
+   def max(self):
+      return self.maxNode()
+
    # This method counts the number of levels in the tree starting
    # at the root
    #################################################################
@@ -335,10 +545,11 @@ class BinarySearchTree(object):
    def delete(self, goal):
 
       # Find the node, and its parent
-      node, parent = self.__findNodeByValue(goal)
+      node, parent = self.__findNodeByValue(self.__keyOf(goal))
 
       # If node was found then perform deletion at node under the parent
       if node is not None:
+         self.__count -= 1
          return self.__delete(parent, node)
 
       # Else return None for no deletion
@@ -408,6 +619,7 @@ class BinarySearchTree(object):
       # Replace node to delete with successor's value and key
       node.value = successor.value
       node.key = successor.key
+      node.sortKey = successor.sortKey
 
       # Remove successor node
       self.__delete(parent, successor)
@@ -431,40 +643,6 @@ class BinarySearchTree(object):
       differenceInRightAndLeftLevels = totalRightLevels - totalLeftLevels
       return differenceInRightAndLeftLevels
 
-   # This method computes all nodes with an unbalanced number of levels
-   # on the right and left side that exceeds the threshold given (default 1)
-   #################################################################
-   def __allUnbalancedNodesByLevels(self, by):
-      # check if binary tree is empty
-      if self.isEmpty():
-         return 0
-
-      # Create Stack to hold nodes with unbalanced levels
-      stackOfNodesWithUnbalancedLevels = Stack()
-
-      # Traverse through all nodes checking if their levels are balanced
-      for key, value in self.__balanceCheckTraverse(self.__root):
-         currentNode, parentNode = self.__findNodeByValue(value)
-
-         # set up variables to keep track of each child node of the root
-         leftChildNode = currentNode.leftChild
-         rightChildNode = currentNode.rightChild
-
-         # count the number of levels on each side of the node and
-         # calculate the absolute value of the difference
-         totalLeftLevels = self.__levels(leftChildNode)
-         totalRightLevels = self.__levels(rightChildNode)
-         differenceInLevels = abs(totalRightLevels - totalLeftLevels)
-
-         # If the difference of left and right levels exceeds our
-         # given limit (by), add node to stack tracking all nodes with
-         # unbalanced left and right levels
-         if differenceInLevels > by:
-            stackOfNodesWithUnbalancedLevels.push(currentNode)
-
-      # Return the stack nodes with unbalanced nodes after checking all nodes
-      return stackOfNodesWithUnbalancedLevels
-
    # This method computes the number of nodes in the right subtree minus
    # the number of nodes in the left subtree
    #################################################################
@@ -485,86 +663,65 @@ class BinarySearchTree(object):
       differenceInRightAndLeftNodes = totalRightNodes - totalLeftNodes
       return differenceInRightAndLeftNodes
 
-   # This method computes all nodes with an unbalanced number of nodes
-   # on the right and left side that exceeds the threshold given (default 1)
+   # This method is a generator that makes one iterative post-order
+   # pass over the tree, working out the levels and nodes of every
+   # subtree on the way. It yields each node whose left and right sides
+   # differ by more than the threshold (by), along with whether they
+   # differ in levels and whether they differ in nodes
    #################################################################
-   def __allUnbalancedNodesByNodes(self, by):
-
-      # check if binary tree is empty
-      if self.isEmpty():
-         return 0
-
-      # Create Stack to hold nodes with unbalanced nodes
-      stackOfNodesWithUnbalancedNodes = Stack()
-
-      # Find any unbalanced nodes and use the .__balanceCheckTraverse()
-      # method to recursively traverse through the tree
-      for key, value in self.__balanceCheckTraverse(self.__root):
-         currentNode, parentNode = self.__findNodeByValue(value)
-
-         # set up variables to keep track of each child node of the root
-         leftChildNode = currentNode.leftChild
-         rightChildNode = currentNode.rightChild
-
-         #count the number of nodes on each side of the root and
-         # calculate the absolute value of the difference
-         totalLeftNodes = self.__nodes(leftChildNode)
-         totalRightNodes = self.__nodes(rightChildNode)
-         nodesNodeBalance = abs(totalRightNodes - totalLeftNodes)
-
-         # If the difference of left and right nodes exceeds our
-         # given limit (by), add root node to stack tracking all nodes with
-         # unbalanced left and right nodes
-         if nodesNodeBalance > by:
-            stackOfNodesWithUnbalancedNodes.push(currentNode)
-
-      # Return the stack of unbalanced nodes after checking all nodes
-      return stackOfNodesWithUnbalancedNodes
-
-   # This method recursively traverses a binary search tree with in-order
-   # traversal
-   #################################################################
-   def __balanceCheckTraverse(self, node):
-      # If subtree is empty, traversal is done
-      if node is None:
-         return
-
-      if node:
-         # Recursively traverse the left subtree
-         for childKey, childValue in self.__balanceCheckTraverse(node.leftChild):
-            yield (childKey, childValue)  # yielding its nodes
-
-         # Yield the current node's (subtree's root node) key and value
-         yield (node.key, node.value)
-
-         # Recursively traverse right subtree
-         for childKey, childValue in self.__balanceCheckTraverse(node.rightChild):
-            yield (childKey, childValue)  # yielding its nodes
-
-   # This method returns a list of nodes that are unbalanced based
-   # off of their nodes and nodes that are unbalanced based off of their
-   # levels
+   def __unbalancedNodes(self, by):
+
+      # Each finished subtree leaves its levels and nodes on the
+      # results stack
+      results = []
+      stack = [(self.__root, False)]
+      while stack:
+         node, childrenDone = stack.pop()
+
+         # An empty subtree has no levels and no nodes
+         if node is None:
+            results.append((0, 0))
+
+         # On the first visit, come back to the node after both of its
+         # subtrees, left first
+         elif not childrenDone:
+            stack.append((node, True))
+            stack.append((node.rightChild, False))
+            stack.append((node.leftChild, False))
+
+         # Else both subtree results are on top of the results stack
+         else:
+            rightLevels, rightNodes = results.pop()
+            leftLevels, leftNodes = results.pop()
+            results.append((max(leftLevels, rightLevels) + 1,
+                            leftNodes + rightNodes + 1))
+
+            unbalancedLevels = abs(rightLevels - leftLevels) > by
+            unbalancedNodes = abs(rightNodes - leftNodes) > by
+            if unbalancedLevels or unbalancedNodes:
+               yield node, unbalancedLevels, unbalancedNodes
+
+   # This method returns two lists of (key, value) pairs in post-order:
+   # the nodes whose left and right levels differ by more than the
+   # threshold given (default 1), and the nodes whose left and right
+   # node counts do
    #################################################################
    def unbalancedNodes(self, by=1):
-
-      # Check which nodes have unbalanced levels and print their key/value
-      # pairs
-      stackOfNodesWithUnbalancedLevels = self.__allUnbalancedNodesByLevels(by)
-      print("Nodes with unbalanced levels: ")
-      stackOfNodesWithUnbalancedLevels.traverse()
-
-      # Check which nodes have unbalanced nodes and print their key/value
-      # pairs
-      stackOfNodesWithUnbalancedNodes = self.__allUnbalancedNodesByNodes(by)
-      print("Nodes with unbalanced nodes: ")
-      stackOfNodesWithUnbalancedNodes.traverse()
-
-
+      byLevels = []
+      byNodes = []
+      for node, unbalancedLevels, unbalancedNodes in self.__unbalancedNodes(by):
+         if unbalancedLevels:
+            byLevels.append((node.key, node.value))
+         if unbalancedNodes:
+            byNodes.append((node.key, node.value))
+      return byLevels, byNodes
+
+   # This method checks if every node's left and right levels differ
+   # by no more than the threshold given (default 1), stopping at the
+   # first node that does
+   #################################################################
    def balanceTrueOrFalse(self, by=1):
-      # Check which nodes have unbalanced levels and print their key/value
-      # pairs
-      stackOfNodesWithUnbalancedLevels = self.__allUnbalancedNodesByLevels(by)
-      if stackOfNodesWithUnbalancedLevels.isEmpty():
-         return True
-
-      return False
+      for node, unbalancedLevels, unbalancedNodes in self.__unbalancedNodes(by):
+         if unbalancedLevels:
+            return False
+      return True
@@ -0,0 +1,286 @@
+#################################################################
+# ConcurrentAVLtree.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This file makes AVL trees safe to share between threads.
+# ConcurrentAVLtree guards an AVLtree with a reader-writer lock,
+# so readers run together and writers take turns. Its iterators
+# fail fast if the tree changes under them. SnapshotAVLtree keeps
+# a persistent tree instead, so readers take no lock at all and
+# every iterator sees a stable snapshot.
+#################################################################
+
+from AVLtree import *
+from PersistentAVLtree import *
+from contextlib import contextmanager
+from itertools import islice
+import threading
+
+# A lock that lets many readers in at once, or one writer alone.
+# Waiting writers go first, so a steady stream of readers cannot
+# starve them. It is not reentrant
+#################################################################
+class ReadWriteLock(object):
+
+   # This constructor initializes an unheld lock
+   #################################################################
+   def __init__(self):
+      self.__condition = threading.Condition(threading.Lock())
+      self.__readers = 0         # Number of readers holding the lock
+      self.__writer = False      # Whether a writer holds the lock
+      self.__waitingWriters = 0
+
+   # This method waits until no writer holds or wants the lock, then
+   # takes it for reading
+   #################################################################
+   def acquireRead(self):
+      with self.__condition:
+         while self.__writer or self.__waitingWriters:
+            self.__condition.wait()
+         self.__readers += 1
+
+   # This method releases the lock taken for reading
+   #################################################################
+   def releaseRead(self):
+      with self.__condition:
+         self.__readers -= 1
+         if self.__readers == 0:
+            self.__condition.notify_all()
+
+   # This method waits until nobody holds the lock, then takes it for
+   # writing
+   #################################################################
+   def acquireWrite(self):
+      with self.__condition:
+         self.__waitingWriters += 1
+         while self.__writer or self.__readers:
+            self.__condition.wait()
+         self.__waitingWriters -= 1
+         self.__writer = True
+
+   # This method releases the lock taken for writing
+   #################################################################
+   def releaseWrite(self):
+      with self.__condition:
+         self.__writer = False
+         self.__condition.notify_all()
+
+   # This method is a context manager that holds the lock for reading
+   #################################################################
+   @contextmanager
+   def reading(self):
+      self.acquireRead()
+      try:
+         yield
+      finally:
+         self.releaseRead()
+
+   # This method is a context manager that holds the lock for writing
+   #################################################################
+   @contextmanager
+   def writing(self):
+      self.acquireWrite()
+      try:
+         yield
+      finally:
+         self.releaseWrite()
+
+# An AVL tree that many threads can share. Lookups hold the lock for
+# reading and changes hold it for writing. Every change bumps a
+# version number, and iterators raise RuntimeError if it moves
+#################################################################
+class ConcurrentAVLtree(object):
+
+   # This constructor initializes an empty tree. Options are passed on
+   # to AVLtree, and batchSize is how many items iterators read under
+   # the lock at a time. Stats are refused, since readers sharing the
+   # lock would update the counters together
+   #################################################################
+   def __init__(self, batchSize=64, **options):
+      if options.get('stats'):
+         raise ValueError("Stats are not supported on a shared tree")
+      self.__tree = AVLtree(**options)
+      self.__lock = ReadWriteLock()
+      self.__version = 0
+      self.__batchSize = batchSize
+
+   # This method inserts an item, returning True for a new value and
+   # False for an updated key
+   #################################################################
+   def insert(self, key, value):
+      with self.__lock.writing():
+         self.__version += 1
+         return self.__tree.insert(key, value)
+
+   # This method deletes the item with a value, returning whether it
+   # was found
+   #################################################################
+   def delete(self, soughtValue):
+      with self.__lock.writing():
+         self.__version += 1
+         return self.__tree.delete(soughtValue)
+
+   # This method runs a function on the tree while holding the lock
+   # for writing, so several changes can be made as one step. The
+   # function must not call back into this wrapper
+   #################################################################
+   def update(self, function):
+      with self.__lock.writing():
+         self.__version += 1
+         return function(self.__tree)
+
+   # This method calls one of the tree's lookup methods while holding
+   # the lock for reading
+   #################################################################
+   def __read(self, name, *args):
+      with self.__lock.reading():
+         return getattr(self.__tree, name)(*args)
+
+   def search(self, soughtValue):
+      return self.__read('search', soughtValue)
+
+   def search_many(self, soughtValues):
+      return self.__read('search_many', list(soughtValues))
+
+   def search_by_key(self, key):
+      return self.__read('search_by_key', key)
+
+   def floor(self, soughtValue):
+      return self.__read('floor', soughtValue)
+
+   def ceiling(self, soughtValue):
+      return self.__read('ceiling', soughtValue)
+
+   def lower(self, soughtValue):
+      return self.__read('lower', soughtValue)
+
+   def higher(self, soughtValue):
+      return self.__read('higher', soughtValue)
+
+   def min(self):
+      return self.__read('min')
+
+   def max(self):
+      return self.__read('max')
+
+   def rank(self, soughtValue):
+      return self.__read('rank', soughtValue)
+
+   def select(self, index):
+      return self.__read('select', index)
+
+   def count_range(self, lo, hi):
+      return self.__read('count_range', lo, hi)
+
+   def isEmpty(self):
+      return self.__read('isEmpty')
+
+   def validate(self):
+      return self.__read('validate')
+
+   def __len__(self):
+      return self.__read('__len__')
+
+   # This method traverses the tree in pre, in, or post order. It is a
+   # generator that raises RuntimeError if the tree changes before it
+   # finishes
+   #################################################################
+   def traverse(self, traverseType='in'):
+      return self.__failFast(lambda: self.__tree.traverse(traverseType))
+
+   # This method is a generator of the (key, value) pairs with values
+   # between lo and hi, like AVLtree.items(). It raises RuntimeError if
+   # the tree changes before it finishes
+   #################################################################
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      return self.__failFast(
+         lambda: self.__tree.items(lo, hi, inclusive, reverse))
+
+   # This method is a generator that reads an iterator over the tree a
+   # batch at a time while holding the lock for reading. It checks the
+   # version before each batch, so it never advances the iterator after
+   # the tree has changed. Each read takes one item more than it yields
+   # and holds it for the next batch, so it knows the iterator has run
+   # out as soon as it has. It yields outside the lock, so a slow
+   # caller does not hold up writers
+   #################################################################
+   def __failFast(self, makeIterator):
+      with self.__lock.reading():
+         version = self.__version
+         iterator = makeIterator()
+
+      batchSize = self.__batchSize
+      batch = []
+      while True:
+         with self.__lock.reading():
+            if self.__version != version:
+               raise RuntimeError("Tree changed during iteration")
+            batch.extend(islice(iterator, batchSize + 1 - len(batch)))
+
+         # If the iterator ran out, the traversal is done
+         if len(batch) <= batchSize:
+            yield from batch
+            return
+         extra = batch.pop()
+         yield from batch
+         batch = [extra]
+
+# An AVL tree that many threads can share without locking reads. It
+# holds a persistent tree, and each change swaps in a new one under a
+# lock that only writers take. Readers use whichever tree is current
+# when they start, so an iterator always sees one stable snapshot
+#################################################################
+class SnapshotAVLtree(object):
+
+   # This constructor initializes an empty tree. A key function is
+   # passed on to the persistent tree
+   #################################################################
+   def __init__(self, key=None):
+      self.__tree = PersistentAVLtree(key=key)
+      self.__writeLock = threading.Lock()
+
+   # This method returns the current tree as a snapshot that never
+   # changes
+   #################################################################
+   def snapshot(self):
+      return self.__tree
+
+   # This method inserts an item into a new version of the tree,
+   # returning True for a new value and False for an updated key
+   #################################################################
+   def insert(self, key, value):
+      with self.__writeLock:
+         tree = self.__tree.insert(key, value)
+         added = len(tree) > len(self.__tree)
+         self.__tree = tree
+         return added
+
+   # This method deletes the item with a value from a new version of
+   # the tree, returning whether it was found
+   #################################################################
+   def delete(self, soughtValue):
+      with self.__writeLock:
+         tree = self.__tree.delete(soughtValue)
+         found = tree is not self.__tree
+         self.__tree = tree
+         return found
+
+   # These methods read the current snapshot without any lock
+   #################################################################
+   def search(self, soughtValue):
+      return self.__tree.search(soughtValue)
+
+   def isEmpty(self):
+      return self.__tree.isEmpty()
+
+   def __len__(self):
+      return len(self.__tree)
+
+   def traverse(self, traverseType='in'):
+      return self.__tree.traverse(traverseType)
+
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      return self.__tree.items(lo, hi, inclusive, reverse)
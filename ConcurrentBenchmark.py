@@ -0,0 +1,128 @@
+#################################################################
+# ConcurrentBenchmark.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This program stress tests the shared AVL trees. Reader threads
+# search, scan ranges, and traverse while writer threads insert
+# and delete, all on one tree. It counts each kind of operation,
+# counts the iterators that fail fast, and checks the tree when
+# the threads stop. Run it with optional reader count, writer
+# count, and seconds, for example:
+#    python ConcurrentBenchmark.py 8 2 2.0
+#################################################################
+
+from ConcurrentAVLtree import *
+import random
+import sys
+import threading
+import time
+
+def main():
+   readers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+   writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+   seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+   size = 10000
+
+   print(f"{readers} readers and {writers} writers for {seconds}s "
+         f"on {size} items")
+   print(f"{'tree':<20}{'reads/s':>10}{'writes/s':>10}{'scans/s':>10}"
+         f"{'failed scans':>14}")
+
+   for treeClass in (ConcurrentAVLtree, SnapshotAVLtree):
+      tree = treeClass()
+      for value in range(0, 2 * size, 2):
+         tree.insert(str(value), value)
+      counts = stress(tree, readers, writers, seconds, size)
+      print(f"{treeClass.__name__:<20}{counts['reads'] / seconds:>10.0f}"
+            f"{counts['writes'] / seconds:>10.0f}"
+            f"{counts['scans'] / seconds:>10.0f}{counts['failedScans']:>14}")
+      checkTree(tree)
+
+# This function runs reader and writer threads on a tree until time
+# runs out and returns the number of each kind of operation. Any
+# error other than a failed scan stops the program
+#########################################################################
+def stress(tree, readers, writers, seconds, size):
+   counts = {'reads': 0, 'writes': 0, 'scans': 0, 'failedScans': 0}
+   countLock = threading.Lock()
+   errors = []
+   stop = threading.Event()
+
+   def record(reads=0, writes=0, scans=0, failedScans=0):
+      with countLock:
+         counts['reads'] += reads
+         counts['writes'] += writes
+         counts['scans'] += scans
+         counts['failedScans'] += failedScans
+
+   def reader(seed):
+      rand = random.Random(seed)
+      reads = scans = failedScans = 0
+      try:
+         while not stop.is_set():
+            for i in range(100):
+               tree.search(rand.randrange(2 * size))
+            reads += 100
+            lo = rand.randrange(2 * size)
+            try:
+               checkOrder(tree.items(lo, lo + 200))
+               checkOrder(tree.traverse('in'))
+               scans += 2
+            except RuntimeError:
+               failedScans += 1
+      except Exception as error:
+         errors.append(error)
+      record(reads=reads, scans=scans, failedScans=failedScans)
+
+   def writer(seed):
+      rand = random.Random(seed)
+      writes = 0
+      try:
+         while not stop.is_set():
+            value = rand.randrange(2 * size)
+            if rand.random() < 0.5:
+               tree.insert(str(value), value)
+            else:
+               tree.delete(value)
+            writes += 1
+      except Exception as error:
+         errors.append(error)
+      record(writes=writes)
+
+   threads = ([threading.Thread(target=reader, args=(i,))
+               for i in range(readers)] +
+              [threading.Thread(target=writer, args=(-1 - i,))
+               for i in range(writers)])
+   for thread in threads:
+      thread.start()
+   time.sleep(seconds)
+   stop.set()
+   for thread in threads:
+      thread.join()
+   if errors:
+      raise errors[0]
+   return counts
+
+# This function raises an exception unless the (key, value) pairs
+# from an iterator come in increasing value order with matching keys
+#########################################################################
+def checkOrder(pairs):
+   last = None
+   for key, value in pairs:
+      if (last is not None and not last < value) or key != str(value):
+         raise Exception("Scan saw a damaged tree at value " + str(value))
+      last = value
+
+# This function checks a tree once all the threads have stopped
+#########################################################################
+def checkTree(tree):
+   checkOrder(tree.traverse('in'))
+   if isinstance(tree, ConcurrentAVLtree) and not tree.validate()['valid']:
+      raise Exception("Tree is not a valid AVL tree after stress test")
+
+# execute main function
+if __name__ == '__main__':
+   main()
@@ -0,0 +1,240 @@
+#################################################################
+# DoublyLinkedList.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# Implement a doubly linked list that keeps both its first and
+# last links. Inserting and deleting at either end, removing a
+# link, and moving a link to either end all take constant time.
+# The insert methods hand back the new link so callers can hold
+# on to it, which is what LRU and FIFO caches need.
+#################################################################
+
+# A class for each link of a doubly linked list. Callers may keep
+# links as handles and read their data, but only the list changes
+# their neighbor links
+#################################################################
+class DoublyLink(object):
+   __slots__ = ('__linkValue', '_prev', '_next', '_owner')
+
+   # Constructor that initializes a link that is not yet in a list
+   #################################################################
+   def __init__(self, linkValue):
+      self.__linkValue = linkValue
+      self._prev = self._next = None
+      self._owner = None
+
+   # This method returns the data stored in a link
+   #################################################################
+   def getData(self):
+      return self.__linkValue
+
+   # This method sets or updates the data in a link
+   #################################################################
+   def setData(self, linkValue):
+      self.__linkValue = linkValue
+
+   # This method returns the next link, or None for the last link
+   #################################################################
+   def getNext(self):
+      return self._next
+
+   # This method returns the previous link, or None for the first link
+   #################################################################
+   def getPrev(self):
+      return self._prev
+
+   # This method tests if the link is the last in its list
+   #################################################################
+   def isLast(self):
+      return self._next is None
+
+   # This method makes a string representation of a link
+   #################################################################
+   def __str__(self):
+      return str(self.getData())
+
+# A class to make a doubly linked list that tracks its first link,
+# last link, and length
+#################################################################
+class DoublyLinkedList(object):
+
+   # This constructor initializes an empty doubly linked list
+   #################################################################
+   def __init__(self):
+      self.__first = None  # Reference to first link
+      self.__last = None   # Reference to last link
+      self.__length = 0
+
+   # This method returns the first link in the list
+   #################################################################
+   def getFirst(self):
+      return self.__first
+
+   # This method returns the last link in the list
+   #################################################################
+   def getLast(self):
+      return self.__last
+
+   # This method tests for an empty list
+   #################################################################
+   def isEmpty(self):
+      return self.__first is None
+
+   # This method returns the number of links in the list
+   #################################################################
+   def __len__(self):
+      return self.__length
+
+   # This method returns the first data item in the list
+   #################################################################
+   def first(self):
+      if self.__first is None:
+         raise Exception("No first item in empty list")
+      return self.__first.getData()
+
+   # This method returns the last data item in the list
+   #################################################################
+   def last(self):
+      if self.__last is None:
+         raise Exception("No last item in empty list")
+      return self.__last.getData()
+
+   # This method applies a function to all items in list from first to
+   # last, with the default function being to print
+   #################################################################
+   def traverse(self, func=print):
+      link = self.__first
+      while link is not None:
+         func(link.getData())
+         link = link._next
+
+   # This method builds a string representation of the list
+   #################################################################
+   def __str__(self):
+      items = []
+      self.traverse(lambda datum: items.append(str(datum)))
+      return "[" + " > ".join(items) + "]"
+
+   # This method inserts a new item at the front of the list and
+   # returns its link
+   #################################################################
+   def insert(self, datum):
+      link = DoublyLink(datum)
+      self.__linkFirst(link)
+      return link
+
+   # This method adds a new item at the end of the list and returns its
+   # link
+   #################################################################
+   def append(self, datum):
+      link = DoublyLink(datum)
+      self.__linkLast(link)
+      return link
+
+   # This method deletes the first link and returns its item
+   #################################################################
+   def deleteFirst(self):
+      if self.__first is None:
+         raise Exception("Cannot delete first of empty list")
+      return self.__unlink(self.__first)
+
+   # This method deletes the last link and returns its item
+   #################################################################
+   def pop_last(self):
+      if self.__last is None:
+         raise Exception("Cannot delete last of empty list")
+      return self.__unlink(self.__last)
+
+   # This method deletes a link held by the caller and returns its item
+   #################################################################
+   def remove(self, link):
+      self.__checkOwner(link)
+      return self.__unlink(link)
+
+   # This method moves a link held by the caller to the front of the
+   # list
+   #################################################################
+   def move_to_front(self, link):
+      self.__checkOwner(link)
+      if link is not self.__first:
+         self.__unlink(link)
+         self.__linkFirst(link)
+
+   # This method moves a link held by the caller to the end of the list
+   #################################################################
+   def move_to_end(self, link):
+      self.__checkOwner(link)
+      if link is not self.__last:
+         self.__unlink(link)
+         self.__linkLast(link)
+
+   # This method finds the first link whose item's key matches the
+   # value sought
+   #################################################################
+   def find(self, soughtValue, key):
+      link = self.__first
+      while link is not None:
+         if key(link.getData()) == soughtValue:
+            return link
+         link = link._next
+
+   # This method finds the first item whose key matches the value
+   # sought
+   #################################################################
+   def search(self, soughtValue, key):
+      link = self.find(soughtValue, key)
+      if link is not None:
+         return link.getData()
+
+   # This method raises an exception unless a link belongs to this list
+   #################################################################
+   def __checkOwner(self, link):
+      if not isinstance(link, DoublyLink) or link._owner is not self:
+         raise Exception("Link is not in this list")
+
+   # This method links a free link in at the front of the list
+   #################################################################
+   def __linkFirst(self, link):
+      first = self.__first
+      link._prev = None
+      link._next = first
+      link._owner = self
+      if first is None:
+         self.__last = link
+      else:
+         first._prev = link
+      self.__first = link
+      self.__length += 1
+
+   # This method links a free link in at the end of the list
+   #################################################################
+   def __linkLast(self, link):
+      last = self.__last
+      link._prev = last
+      link._next = None
+      link._owner = self
+      if last is None:
+         self.__first = link
+      else:
+         last._next = link
+      self.__last = link
+      self.__length += 1
+
+   # This method unlinks a link from the list and returns its item
+   #################################################################
+   def __unlink(self, link):
+      before, after = link._prev, link._next
+      if before is None:
+         self.__first = after
+      else:
+         before._next = after
+      if after is None:
+         self.__last = before
+      else:
+         after._prev = before
+      link._prev = link._next = link._owner = None
+      self.__length -= 1
+      return link.getData()
@@ -0,0 +1,374 @@
+#################################################################
+# DurableAVLtree.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This file keeps an AVL tree on disk so no acknowledged change is
+# lost in a crash. Every insert and delete is appended to a write-
+# ahead log before it returns. Writers that arrive together share
+# one fsync (group commit), and syncEvery lets a caller trade some
+# safety for fewer fsyncs. A background thread folds the log into
+# a snapshot file once it grows, and opening the directory again
+# loads the latest snapshot and replays the log after it.
+#################################################################
+
+from AVLtree import *
+from AVLtree import _encodeItem, _decodeItem
+import os
+import re
+import struct
+import threading
+import zlib
+
+# A log segment starts with its magic bytes and version. Each record
+# is its payload length, the CRC32 of the payload, and the payload:
+# an operation byte, then the key and value of an insert or the value
+# of a delete, encoded like the records in a snapshot
+#########################################################################
+_LOG_MAGIC = b'AVLW'
+_LOG_VERSION = 1
+_LOG_HEADER = struct.Struct('<4sI')
+_RECORD = struct.Struct('<II')
+_INSERT, _DELETE = b'ID'
+_SEGMENT_NAME = re.compile(r'wal-(\d+)\.log$')
+_SNAPSHOT_NAME = re.compile(r'snapshot-(\d+)\.avlt$')
+
+class DurableAVLtree(object):
+
+   # This constructor opens the tree kept in a directory, creating the
+   # directory if needed, and recovers its items. Writes wait for an
+   # fsync of the log at least every syncEvery records, and unsynced
+   # records are flushed every syncInterval seconds. The log is folded
+   # into a new snapshot once it holds compactBytes. Setting fsync to
+   # False only hands the log to the operating system, which survives
+   # a crash of the program but not of the machine. Any other options
+   # are passed on to AVLtree and must be the same every time
+   #####################################################################
+   def __init__(self, directory, syncEvery=1, syncInterval=1.0,
+                compactBytes=64 << 20, fsync=True, **options):
+      self.__directory = directory
+      self.__syncEvery = syncEvery
+      self.__syncInterval = syncInterval
+      self.__compactBytes = compactBytes
+      self.__fsync = fsync
+      self.__options = options
+
+      self.__lock = threading.Lock()         # Guards the tree and log buffer
+      self.__syncLock = threading.Lock()     # Held by the one thread syncing
+      self.__compactLock = threading.Lock()  # Held by the one compaction
+      self.__pending = bytearray()           # Records not yet written
+      self.__lastRecord = 0                  # Number of the newest record
+      self.__syncedRecord = 0                # Newest record on disk
+      self.__failure = None                  # Error from the background
+
+      os.makedirs(directory, exist_ok=True)
+      self.__tree, segment = self.__recover()
+      self.__openSegment(segment)
+
+      # Start the thread that flushes and compacts in the background
+      self.__closed = False
+      self.__wake = threading.Event()
+      self.__background = threading.Thread(target=self.__runBackground,
+                                           daemon=True)
+      self.__background.start()
+
+   # These methods let the tree be used in a with statement that closes
+   # it at the end
+   #####################################################################
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exception):
+      self.close()
+
+   # This method inserts an item, returning True for a new value and
+   # False for an updated key, once the change is logged. The record is
+   # encoded first, so an item that can't be logged never reaches the
+   # tree
+   #####################################################################
+   def insert(self, key, value):
+      encoded = self.__encode(_INSERT, key, value)
+      with self.__lock:
+         self.__checkOpen()
+         added = self.__tree.insert(key, value)
+         record = self.__append(encoded)
+      self.__commit(record)
+      return added
+
+   # This method deletes the item with a value, returning whether it
+   # was found, once the change is logged
+   #####################################################################
+   def delete(self, soughtValue):
+      encoded = self.__encode(_DELETE, soughtValue)
+      with self.__lock:
+         self.__checkOpen()
+         if not self.__tree.delete(soughtValue):
+            return False
+         record = self.__append(encoded)
+      self.__commit(record)
+      return True
+
+   # These methods read the tree while holding its lock
+   #####################################################################
+   def search(self, soughtValue):
+      with self.__lock:
+         return self.__tree.search(soughtValue)
+
+   def isEmpty(self):
+      with self.__lock:
+         return self.__tree.isEmpty()
+
+   def __len__(self):
+      with self.__lock:
+         return len(self.__tree)
+
+   # This method returns a list of the (key, value) pairs in pre, in, or
+   # post order
+   #####################################################################
+   def traverse(self, traverseType='in'):
+      with self.__lock:
+         return list(self.__tree.traverse(traverseType))
+
+   # This method writes and syncs every logged change
+   #####################################################################
+   def flush(self):
+      self.__commit(self.__lastRecord, force=True)
+
+   # This method flushes the log and closes it. The tree can't be
+   # changed after it is closed. A log that has already failed is
+   # closed without flushing
+   #####################################################################
+   def close(self):
+      if self.__closed:
+         return
+      try:
+         if self.__failure is None:
+            self.flush()
+      finally:
+         self.__closed = True
+         self.__wake.set()
+         self.__background.join()
+         self.__file.close()
+
+   # This method raises an exception if the tree is closed or the
+   # background thread has failed
+   #####################################################################
+   def __checkOpen(self):
+      if self.__closed:
+         raise Exception("Durable tree is closed")
+      if self.__failure is not None:
+         raise self.__failure
+
+   # This method returns a log record for an operation on some items,
+   # raising an exception if an item can't be encoded
+   #####################################################################
+   def __encode(self, operation, *items):
+      payload = bytearray((operation,))
+      for item in items:
+         _encodeItem(payload, item)
+      return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+   # This method adds an encoded record to the log buffer and returns
+   # its number
+   #####################################################################
+   def __append(self, encoded):
+      self.__pending += encoded
+      self.__lastRecord += 1
+      return self.__lastRecord
+
+   # This method makes sure a record is on disk, unless it is within
+   # syncEvery records of the last sync and force is False. One thread
+   # at a time writes out all the records buffered so far, while others
+   # wait for it and then find their record already synced
+   #####################################################################
+   def __commit(self, record, force=False):
+      if not force and record - self.__syncedRecord < self.__syncEvery:
+         return
+      with self.__syncLock:
+         if self.__syncedRecord < record:
+            self.__writeLog()
+
+   # This method writes the buffered records to the log and syncs it.
+   # The caller must hold the sync lock. If the write or sync fails,
+   # the records may be lost or only partly written while the tree
+   # already holds their changes, so the failure is kept and every
+   # later change or flush raises it. Reopening the directory recovers
+   # the changes that did reach the log
+   #####################################################################
+   def __writeLog(self):
+      with self.__lock:
+         if self.__failure is not None:
+            raise self.__failure
+         data, self.__pending = self.__pending, bytearray()
+         last = self.__lastRecord
+      try:
+         self.__file.write(data)
+         self.__file.flush()
+         if self.__fsync:
+            os.fsync(self.__file.fileno())
+      except Exception as error:
+         self.__failure = error
+         raise
+      self.__syncedRecord = last
+      self.__segmentBytes += len(data)
+      if self.__segmentBytes >= self.__compactBytes:
+         self.__wake.set()
+
+   # This method is the background thread's loop, which flushes the
+   # log every syncInterval seconds and compacts it once it is large
+   #####################################################################
+   def __runBackground(self):
+      while not self.__closed:
+         self.__wake.wait(self.__syncInterval)
+         self.__wake.clear()
+         if self.__closed:
+            return
+         try:
+            if self.__syncedRecord < self.__lastRecord:
+               self.flush()
+            if self.__segmentBytes >= self.__compactBytes:
+               self.compact()
+         except Exception as error:
+            self.__failure = error
+            return
+
+   # This method folds the log into a new snapshot. It writes out the
+   # log, starts a new segment, and copies the items while writers are
+   # held off, then saves the snapshot and removes the old files while
+   # they carry on
+   #####################################################################
+   def compact(self):
+      with self.__compactLock:
+         if self.__closed:
+            raise Exception("Durable tree is closed")
+         with self.__syncLock:
+            self.__writeLog()
+            with self.__lock:
+               segment = self.__segment + 1
+               self.__file.close()
+               self.__openSegment(segment)
+               pairs = list(self.__tree.traverse('in'))
+
+         # The new snapshot holds every record in the older segments
+         key = self.__options.get('key')
+         AVLtree.from_sorted(pairs, key=key).save(
+            self.__path('snapshot', segment))
+         self.__syncDirectory()
+         self.__removeBefore(segment)
+
+   # This method loads the latest snapshot, replays the log segments
+   # written after it, and returns the tree and the next segment number
+   #####################################################################
+   def __recover(self):
+      segments, snapshots = [], []
+      for name in os.listdir(self.__directory):
+         if name.endswith('.tmp'):
+            os.remove(os.path.join(self.__directory, name))
+         elif _SEGMENT_NAME.match(name):
+            segments.append(int(_SEGMENT_NAME.match(name).group(1)))
+         elif _SNAPSHOT_NAME.match(name):
+            snapshots.append(int(_SNAPSHOT_NAME.match(name).group(1)))
+
+      # Start from the latest snapshot, if there is one
+      start = max(snapshots, default=0)
+      if snapshots:
+         tree = AVLtree.load(self.__path('snapshot', start), **self.__options)
+      else:
+         tree = AVLtree(**self.__options)
+
+      # Replay the segments it doesn't hold, in order. Only the last one
+      # can end in a torn record from a crash
+      replay = sorted(segment for segment in segments if segment >= start)
+      for segment in replay:
+         self.__replay(tree, segment, segment == replay[-1])
+      self.__removeBefore(start)
+      return tree, max(replay, default=start) + 1
+
+   # This method applies the records in a log segment to a tree. A
+   # record cut short or failing its check at the end of the last
+   # segment was never acknowledged, so the segment is cut back to the
+   # records before it. Anywhere else it means the log is damaged
+   #####################################################################
+   def __replay(self, tree, segment, last):
+      path = self.__path('wal', segment)
+      with open(path, 'rb') as file:
+         data = file.read()
+      if len(data) < _LOG_HEADER.size:
+         good = 0
+      else:
+         magic, version = _LOG_HEADER.unpack_from(data)
+         if magic != _LOG_MAGIC or version != _LOG_VERSION:
+            raise ValueError("Not a write-ahead log segment: " + path)
+         good = offset = _LOG_HEADER.size
+         while offset + _RECORD.size <= len(data):
+            length, checksum = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+               break
+            self.__applyRecord(tree, payload)
+            good = offset = start + length
+
+      if good < len(data):
+         if not last:
+            raise ValueError("Write-ahead log segment is damaged: " + path)
+         with open(path, 'r+b') as file:
+            file.truncate(good)
+            file.flush()
+            os.fsync(file.fileno())
+
+   # This method applies one log record to a tree
+   #####################################################################
+   def __applyRecord(self, tree, payload):
+      operation = payload[0]
+      first, offset = _decodeItem(payload, 1)
+      if operation == _INSERT:
+         value, offset = _decodeItem(payload, offset)
+         tree.insert(first, value)
+      elif operation == _DELETE:
+         tree.delete(first)
+      else:
+         raise ValueError("Unknown write-ahead log operation: " +
+                          repr(chr(operation)))
+
+   # This method starts a new log segment for appending
+   #####################################################################
+   def __openSegment(self, segment):
+      self.__segment = segment
+      self.__file = open(self.__path('wal', segment), 'wb')
+      self.__file.write(_LOG_HEADER.pack(_LOG_MAGIC, _LOG_VERSION))
+      self.__file.flush()
+      if self.__fsync:
+         os.fsync(self.__file.fileno())
+      self.__syncDirectory()
+      self.__segmentBytes = 0
+
+   # This method removes the snapshots and log segments older than a
+   # segment number
+   #####################################################################
+   def __removeBefore(self, segment):
+      for name in os.listdir(self.__directory):
+         match = _SEGMENT_NAME.match(name) or _SNAPSHOT_NAME.match(name)
+         if match and int(match.group(1)) < segment:
+            os.remove(os.path.join(self.__directory, name))
+
+   # This method returns the path of a log segment or snapshot file
+   #####################################################################
+   def __path(self, kind, segment):
+      name = ('wal-{:08d}.log' if kind == 'wal' else
+              'snapshot-{:08d}.avlt').format(segment)
+      return os.path.join(self.__directory, name)
+
+   # This method syncs the directory so new and renamed files in it
+   # survive a crash, where the system allows it
+   #####################################################################
+   def __syncDirectory(self):
+      if not self.__fsync or not hasattr(os, 'O_DIRECTORY'):
+         return
+      descriptor = os.open(self.__directory, os.O_RDONLY | os.O_DIRECTORY)
+      try:
+         os.fsync(descriptor)
+      finally:
+         os.close(descriptor)
@@ -13,6 +13,9 @@
 #################################################################
 class Link(object):
 
+   # Slots drop the per-link __dict__, since a list can hold many links
+   __slots__ = ('__linkValue', '__referenceNext')
+
    # Constructor that initializes a single link along with the data
    # and reference portions of each link
    #################################################################
@@ -46,6 +49,13 @@ class Link(object):
       else:
          raise Exception("Next link must be Link or None")
 
+   # This method changes the next link without checking its type. It
+   # is for the linked list's own methods, which only ever pass a Link
+   # or None
+   #################################################################
+   def _setNext(self, link):
+      self.__referenceNext = link
+
    # This method tests if the link currently selected is the last
    # by returning true if there is no next link (aka its self.__next
    # attribute (its reference attribute) in the chain equals "None")
@@ -10,9 +10,10 @@
 # Programming Project 10.1
 #################################################################
 # Set up a Stack using a linked list data structure.
-# The binary search tree file imports this file.
+# StackBenchmark.py imports this file.
 #################################################################
 from LinkedList import *
+from collections import deque
 
 # Link stack class that defines a stack by renaming methods from
 # the linked list class
@@ -21,3 +22,54 @@ class Stack(LinkedList):
    push = LinkedList.insert
    pop = LinkedList.deleteFirst
    peek = LinkedList.first
+
+# Stack class with the same methods as the link stack, backed by a
+# collections.deque. It allocates no link object per push and is the
+# faster choice when the links themselves are never needed
+##################################################################
+class DequeStack(object):
+
+   # This constructor initializes an empty stack. Pushing goes straight
+   # to the deque's append method
+   #################################################################
+   def __init__(self):
+      self.__items = deque()
+      self.push = self.__items.append
+
+   # This method removes and returns the top item of the stack
+   #################################################################
+   def pop(self):
+      try:
+         return self.__items.pop()
+      except IndexError:
+         raise Exception("Cannot delete first of empty list") from None
+
+   # This method returns the top item of the stack without removing it
+   #################################################################
+   def peek(self):
+      if not self.__items:
+         raise Exception("No first item in empty list")
+      return self.__items[-1]
+
+   # This method tests for an empty stack
+   #################################################################
+   def isEmpty(self):
+      return not self.__items
+
+   # This method returns the number of items in the stack
+   #################################################################
+   def __len__(self):
+      return len(self.__items)
+
+   # This method applies a function to all items from the top of the
+   # stack down, with the default function being to print
+   #################################################################
+   def traverse(self, func=print):
+      for item in reversed(self.__items):
+         func(item)
+
+   # This method builds a string representation of the stack from the
+   # top down, like the link stack's
+   #################################################################
+   def __str__(self):
+      return "[" + " > ".join(str(item) for item in reversed(self.__items)) + "]"
@@ -19,10 +19,21 @@ from Link import *
 #################################################################
 class LinkedList(object):
 
-   # This constructor initializes a linked list
+   # This constructor initializes a linked list. If a key function is
+   # given, the list also keeps a dictionary from each item's key to
+   # the link (or list) before it, so finding, deleting, and inserting
+   # after an item by key take constant time. Keys must then be unique
+   # and must not change while the item is in the list. If countLength
+   # is True, the list keeps a running count of its links so len()
+   # takes constant time. Links must then only be changed through the
+   # list's methods
    #################################################################
-   def __init__(self):
+   def __init__(self, key=None, countLength=False):
       self.__first = None  # Reference to first Link
+      self.__countLength = countLength
+      self.__length = 0 if countLength else None  # Running count, if any
+      self.__key = key     # Key function for the index, if any
+      self.__index = None if key is None else {}
 
    # This method returns the first link in the linked list
    #################################################################
@@ -33,10 +44,26 @@ class LinkedList(object):
    #################################################################
    def setFirst(self, link):
       if link is None or isinstance(link, Link):
+
+         # Index the new chain before taking it on, so a duplicate key
+         # leaves the list unchanged
+         if self.__index is not None:
+            self.__index = self.__buildIndex(link)
          self.__first = link
+
+         # The new chain may be any length, so count it when next asked
+         if self.__countLength:
+            self.__length = None
       else:
          raise Exception("First link must be Link or None")
 
+   # This method changes the first link without checking its type or
+   # touching the length. It is for the list's own methods, which keep
+   # the length up to date themselves
+   #################################################################
+   def _setNext(self, link):
+      self.__first = link
+
    # This method makes the first link next (so it follows the last in
    # first out ordering)
    #################################################################
@@ -53,15 +80,15 @@ class LinkedList(object):
    # is no 1st link (aka if self.getFirst() returns None)
    #################################################################
    def isEmpty(self):
-      return self.getFirst() is None
+      return self.__first is None
 
    # This method returns the first data item in the list as long as
    # the node is not empty
    #################################################################
    def first(self):
-      if self.isEmpty():
+      if self.__first is None:
          raise Exception("No first item in empty list")
-      return self.getFirst().getData()
+      return self.__first.getData()
 
    # This method applies a function to all items in list with the
    # default function being to print
@@ -73,15 +100,21 @@ class LinkedList(object):
          link = link.getNext()
 
    # This method gets the length (number of nodes/links) of the linked
-   # list
+   # list by counting its links. With countLength, the list's methods
+   # keep a running count instead, and the links are only counted
+   # after setFirst() has swapped in a whole new chain
    #################################################################
    def __len__(self):
-      l = 0
-      link = self.getFirst()
-      while link is not None:
-         l += 1
-         link = link.getNext()
-      return l
+      if self.__length is None:
+         l = 0
+         link = self.getFirst()
+         while link is not None:
+            l += 1
+            link = link.getNext()
+         if not self.__countLength:
+            return l
+         self.__length = l
+      return self.__length
 
    # This method builds a string representation of the linked list
    #################################################################
@@ -99,13 +132,94 @@ class LinkedList(object):
    # then sets it as the first node/link in the linked list)
    #################################################################
    def insert(self, datum):
-      link = Link(datum, self.getFirst())
-      self.setFirst(link)
+      if self.__index is not None:
+         self.__linkAfter(self, datum)
+         return
+      self.__first = Link(datum, self.__first)
+      if self.__length is not None:
+         self.__length += 1
+
+   # This method links a new item after a link (or at the front, if
+   # previous is the list itself), keeping the length and the index up
+   # to date, and returns the new link
+   #################################################################
+   def __linkAfter(self, previous, datum):
+      index = self.__index
+
+      # Refuse a key the index already holds
+      if index is not None:
+         key = self.__key(datum)
+         if key in index:
+            raise Exception("Duplicate key in indexed list")
+
+      link = Link(datum, previous.getNext())
+      previous._setNext(link)
+      if self.__length is not None:
+         self.__length += 1
+
+      # The new item follows previous, and the item after it now
+      # follows the new link
+      if index is not None:
+         index[key] = previous
+         after = link.getNext()
+         if after is not None:
+            index[self.__key(after.getData())] = link
+      return link
+
+   # This method unlinks the link after previous (which may be the list
+   # itself), keeping the length and the index up to date, and returns
+   # its item
+   #################################################################
+   def __unlink(self, previous, link):
+      after = link.getNext()
+      previous._setNext(after)
+      if self.__length is not None:
+         self.__length -= 1
+
+      # Drop the item's key, and the item after it now follows previous
+      if self.__index is not None:
+         del self.__index[self.__key(link.getData())]
+         if after is not None:
+            self.__index[self.__key(after.getData())] = previous
+      return link.getData()
+
+   # This method builds an index from each item's key to the link (or
+   # list) before it for a chain starting at first
+   #################################################################
+   def __buildIndex(self, first):
+      index = {}
+      previous = self
+      link = first
+      while link is not None:
+         key = self.__key(link.getData())
+         if key in index:
+            raise Exception("Duplicate key in indexed list")
+         index[key] = previous
+         previous = link
+         link = link.getNext()
+      return index
+
+   # This method checks whether a lookup with a key function can use
+   # the index. It can if the list is indexed by that function, or if
+   # no function is given
+   #################################################################
+   def __usesIndex(self, key):
+      if self.__index is not None and (key is None or key is self.__key):
+         return True
+      if key is None:
+         raise Exception("No key function for unindexed list")
+      return False
 
    # This method fins the 1st link whose reference variable (self.__next())
    # holds the reference we are searching for
    #################################################################
-   def find(self, soughtValue, key):
+   def find(self, soughtValue, key=None):
+
+      # Look up the link before the item in the index, if possible
+      if self.__usesIndex(key):
+         previous = self.__index.get(soughtValue)
+         return previous.getNext() if previous is not None else None
+
       link = self.getFirst()
       while link is not None:
          if key(link.getData()) == soughtValue:
@@ -115,7 +229,7 @@ class LinkedList(object):
    # This method finds the 1st item whose value matches what we are
    # looking for
    #################################################################
-   def search(self, soughtValue, key):
+   def search(self, soughtValue, key=None):
       link = self.find(soughtValue, key)
       if link is not None:
          return link.getData()
@@ -123,7 +237,7 @@ class LinkedList(object):
    # This method inserts a new node/link after the first node/link
    # with a matching reference variable (self.__next())
    #################################################################
-   def insertAfter(self, soughtValue, newDatum, key):
+   def insertAfter(self, soughtValue, newDatum, key=None):
       link = self.find(soughtValue, key)
 
       # If matching reference variable not found, return False
@@ -132,8 +246,7 @@ class LinkedList(object):
 
       # Else create a new link node value the new value and insert it
       # after the link with the matching reference variable
-      newLink = Link(newDatum, link.getNext())
-      link.setNext(newLink)
+      self.__linkAfter(link, newDatum)
       return True
 
    # This method deletes the first link in the linked list or raises
@@ -142,25 +255,38 @@ class LinkedList(object):
    def deleteFirst(self):
 
       # Raise an exception if the linked list is empty
-      if self.isEmpty():
+      first = self.__first
+      if first is None:
          raise Exception("Cannot delete first of empty list")
 
+      # An indexed list must also drop the item's key
+      if self.__index is not None:
+         return self.__unlink(self, first)
+
       # Else store (in "first") the value held in the first link,
       # remove the link from the linked list, and return the value
       # stored
-      first = self.getFirst()
-      self.setFirst(first.getNext())
+      self.__first = first.getNext()
+      if self.__length is not None:
+         self.__length -= 1
       return first.getData()
 
    # Delete the first Link from the list that is holding the value
    # or data we are searching for
    #################################################################
-   def delete(self, soughtValue, key):
+   def delete(self, soughtValue, key=None):
 
       # Raise an exception if the linked list is empty
       if self.isEmpty():
          raise Exception("Cannot delete from empty linked list")
 
+      # Look up the link before the item in the index, if possible
+      if self.__usesIndex(key):
+         previous = self.__index.get(soughtValue)
+         if previous is None:
+            raise Exception("No item with matching key found in list")
+         return self.__unlink(previous, previous.getNext())
+
       previous = self
       while previous.getNext() is not None:
          link = previous.getNext()
@@ -169,8 +295,7 @@ class LinkedList(object):
          # change the previous' next to be Link's next and
          # return the value found
          if soughtValue == key(link.getData()):
-            previous.setNext(link.getNext())
-            return link.getData()
+            return self.__unlink(previous, link)
 
          # Advance previous to next Link
          previous = link
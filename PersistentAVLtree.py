@@ -0,0 +1,382 @@
+#################################################################
+# PersistentAVLtree.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This file implements a persistent AVL tree. Nodes never change
+# once made, so insert and delete return a new tree that copies
+# only the nodes on the path they touched and shares every other
+# node with the old tree. Any tree can be kept as a snapshot for
+# as long as a reader needs it, at no extra cost.
+#################################################################
+
+class PersistentAVLtree(object):
+
+   # Class to create a node in a persistent AVL tree. A node's fields
+   # are set once when it is made, along with its height and size
+   #####################################################################
+   class __Node(object):
+      __slots__ = ('key', 'value', 'sortKey', 'left', 'right', 'height',
+                   'size')
+
+      # This constructor initializes a node from an item and two
+      # finished subtrees
+      ##################################################################
+      def __init__(self, key, value, sortKey, left, right):
+         self.key = key
+         self.value = value
+         self.sortKey = sortKey
+         self.left = left
+         self.right = right
+         leftHeight, leftSize = (left.height, left.size) if left else (0, 0)
+         if right:
+            self.height = max(leftHeight, right.height) + 1
+            self.size = leftSize + right.size + 1
+         else:
+            self.height = leftHeight + 1
+            self.size = leftSize + 1
+
+      # This method returns the difference in child heights
+      ##################################################################
+      def heightDiff(self):
+         left  = self.left.height  if self.left  else 0
+         right = self.right.height if self.right else 0
+         return left - right
+
+      # This method creates a string representation of a node using a
+      # prefix and its value
+      ##################################################################
+      def __str__(self):
+         return 'AVL>' + str(self.value)
+
+   # This constructor initializes an empty persistent AVL tree. Values
+   # are ordered by key(value) if a key function is given
+   #####################################################################
+   def __init__(self, key=None):
+      self.__root = None # No root node in empty tree
+      self.__sortKey = key
+
+   # This method returns a tree with the same key function and the
+   # given root node
+   #####################################################################
+   def __withRoot(self, root):
+      tree = type(self)(key=self.__sortKey)
+      tree.__root = root
+      return tree
+
+   # This class method builds a balanced tree in one linear pass from
+   # (key, value) pairs already sorted by value with no repeated values
+   #####################################################################
+   @classmethod
+   def from_sorted(cls, pairs, key=None):
+      tree = cls(key=key)
+      pairs = list(pairs)
+      sortKeys = [value if key is None else key(value) for k, value in pairs]
+      for i in range(1, len(pairs)):
+         if not sortKeys[i - 1] < sortKeys[i]:
+            raise ValueError("Pairs are not sorted by unique value")
+      tree.__root = tree.__build(pairs, sortKeys, 0, len(pairs))
+      return tree
+
+   # This method builds a balanced subtree from pairs[lo:hi]
+   #####################################################################
+   def __build(self, pairs, sortKeys, lo, hi):
+      if lo == hi:
+         return None
+      mid = (lo + hi) // 2
+      key, value = pairs[mid]
+      return self.__Node(key, value, sortKeys[mid],
+                         self.__build(pairs, sortKeys, lo, mid),
+                         self.__build(pairs, sortKeys, mid + 1, hi))
+
+   # This method checks if a tree is empty
+   #####################################################################
+   def isEmpty(self):
+      return self.__root is None
+
+   # This method returns the number of items in the tree
+   #####################################################################
+   def __len__(self):
+      return self.__root.size if self.__root else 0
+
+   # This method returns the sort key of a value
+   #####################################################################
+   def __keyOf(self, value):
+      return value if self.__sortKey is None else self.__sortKey(value)
+
+   # This method searches for an item whose value matches a soughtValue
+   # and returns its key
+   #####################################################################
+   def search(self, soughtValue):
+      soughtKey = self.__keyOf(soughtValue)
+      node = self.__root
+      while node is not None:
+         nodeKey = node.sortKey
+         if soughtKey < nodeKey:
+            node = node.left
+         elif nodeKey < soughtKey:
+            node = node.right
+         else:
+            return node.key
+
+   # This method returns a new tree with an item inserted, or with the
+   # key of an existing value updated. This tree is left unchanged
+   #####################################################################
+   def insert(self, key, value):
+      return self.__withRoot(
+         self.__insert(self.__root, key, value, self.__keyOf(value)))
+
+   # This method returns a new subtree with an item inserted, copying
+   # the nodes on the path down to it
+   #####################################################################
+   def __insert(self, node, key, value, sortKey):
+
+      # If the subtree is empty, return a new leaf
+      if node is None:
+         return self.__Node(key, value, sortKey, None, None)
+
+      # Insert on the correct side and rebalance the copied node
+      nodeKey = node.sortKey
+      if sortKey < nodeKey:
+         return self.__balance(node, self.__insert(node.left, key, value,
+                                                   sortKey), node.right)
+      elif nodeKey < sortKey:
+         return self.__balance(node, node.left,
+                               self.__insert(node.right, key, value, sortKey))
+
+      # Else the value is already here, so copy the node with the new key
+      return self.__Node(key, node.value, nodeKey, node.left, node.right)
+
+   # This method returns a new tree without the item whose value
+   # matches soughtValue. If there is no such item, it returns this
+   # tree
+   #####################################################################
+   def delete(self, soughtValue):
+      root = self.__delete(self.__root, self.__keyOf(soughtValue))
+      return self if root is self.__root else self.__withRoot(root)
+
+   # This method returns a subtree without the item whose sort key is
+   # soughtKey, or the same subtree if the item is not in it
+   #####################################################################
+   def __delete(self, node, soughtKey):
+
+      # If subtree is empty, there is nothing to delete
+      if node is None:
+         return None
+
+      # Delete on the correct side. If nothing changed there, share the
+      # whole subtree
+      nodeKey = node.sortKey
+      if soughtKey < nodeKey:
+         left = self.__delete(node.left, soughtKey)
+         return node if left is node.left else self.__balance(node, left,
+                                                              node.right)
+      elif nodeKey < soughtKey:
+         right = self.__delete(node.right, soughtKey)
+         return node if right is node.right else self.__balance(node,
+                                                                node.left,
+                                                                right)
+
+      # Else node's value matches, so a missing child lets the other
+      # child replace it
+      elif node.left is None:
+         return node.right
+      elif node.right is None:
+         return node.left
+
+      # Deleted node has two children, so its successor takes its place
+      right, successor = self.__deleteMin(node.right)
+      return self.__balance(successor, node.left, right)
+
+   # This method returns a subtree without its minimum node, along with
+   # that node
+   #####################################################################
+   def __deleteMin(self, node):
+      if node.left is None:
+         return node.right, node
+      left, minimum = self.__deleteMin(node.left)
+      return self.__balance(node, left, node.right), minimum
+
+   # This method makes a copy of a node's item with new subtrees and
+   # rebalances it, returning the top of the new subtree
+   #####################################################################
+   def __balance(self, item, left, right):
+      node = self.__Node(item.key, item.value, item.sortKey, left, right)
+      diff = node.heightDiff()
+
+      # If node is left heavy, rotate a right heavy left child first and
+      # then rotate right around node
+      if diff > 1:
+         if left.heightDiff() < 0:
+            node = self.__Node(item.key, item.value, item.sortKey,
+                               self.rotateLeft(left), right)
+         node = self.rotateRight(node)
+
+      # If node is right heavy, do the mirror image
+      elif diff < -1:
+         if right.heightDiff() > 0:
+            node = self.__Node(item.key, item.value, item.sortKey,
+                               left, self.rotateRight(right))
+         node = self.rotateLeft(node)
+
+      return node
+
+   # This method returns a copy of a subtree rotated to the right. The
+   # subtrees that move are shared, not copied
+   #####################################################################
+   def rotateRight(self, top):
+      # The node to raise is top's left child, and its right subtree
+      # crosses over to be the left subtree under a copy of the old top
+      toRaise = top.left
+      newTop = self.__Node(top.key, top.value, top.sortKey,
+                           toRaise.right, top.right)
+      return self.__Node(toRaise.key, toRaise.value, toRaise.sortKey,
+                         toRaise.left, newTop)
+
+   # This method returns a copy of a subtree rotated to the left. The
+   # subtrees that move are shared, not copied
+   #####################################################################
+   def rotateLeft(self, top):
+      # The node to raise is top's right child, and its left subtree
+      # crosses over to be the right subtree under a copy of the old top
+      toRaise = top.right
+      newTop = self.__Node(top.key, top.value, top.sortKey,
+                           top.left, toRaise.left)
+      return self.__Node(toRaise.key, toRaise.value, toRaise.sortKey,
+                         newTop, toRaise.right)
+
+   # This method traverses the tree in pre, in, or post order. It is a
+   # non-recursive generator of (key, value) pairs. Since the nodes
+   # never change, it is safe to keep going while other trees are made
+   # from this one
+   #####################################################################
+   def traverse(self, traverseType='in'):
+      # Verify traversal type is an accepted value & raise exception if
+      # not
+      if traverseType not in ['pre', 'in', 'post']:
+         raise ValueError("Unknown traversal type: " + str(traverseType))
+
+      stack = []
+      node = self.__root
+
+      # For in-order, go left as far as possible, then yield a node and
+      # continue with its right subtree
+      if traverseType == 'in':
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.left
+            node = stack.pop()
+            yield (node.key, node.value)
+            node = node.right
+
+      # For pre-order, yield each node before stacking its children so
+      # the left child comes off the stack first
+      elif traverseType == 'pre':
+         if node is not None:
+            stack.append(node)
+         while stack:
+            node = stack.pop()
+            yield (node.key, node.value)
+            if node.right is not None:
+               stack.append(node.right)
+            if node.left is not None:
+               stack.append(node.left)
+
+      # For post-order, go left as far as possible, then yield a node
+      # only once its right subtree has been yielded
+      else:
+         last = None
+         while stack or node is not None:
+            while node is not None:
+               stack.append(node)
+               node = node.left
+            node = stack[-1]
+            if node.right is not None and node.right is not last:
+               node = node.right
+            else:
+               stack.pop()
+               yield (node.key, node.value)
+               last = node
+               node = None
+
+   # This method is a generator of the (key, value) pairs whose values
+   # lie between lo and hi, in value order or in reverse. Either bound
+   # may be None, and inclusive says whether each bound is included
+   #####################################################################
+   def items(self, lo=None, hi=None, inclusive=(True, False), reverse=False):
+      loInclusive, hiInclusive = inclusive
+      if lo is not None:
+         lo = self.__keyOf(lo)
+      if hi is not None:
+         hi = self.__keyOf(hi)
+      stack = []
+      node = self.__root
+
+      # In forward order, stack the path of nodes not below lo, then
+      # yield them, stacking the left spine of each right subtree
+      if not reverse:
+         while node is not None:
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               node = node.right
+            else:
+               stack.append(node)
+               node = node.left
+         while stack:
+            node = stack.pop()
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               return
+            yield (node.key, node.value)
+            node = node.right
+            while node is not None:
+               stack.append(node)
+               node = node.left
+
+      # In reverse order, do the mirror image starting from hi
+      else:
+         while node is not None:
+            if hi is not None and (hi < node.sortKey if hiInclusive else
+                                   not node.sortKey < hi):
+               node = node.left
+            else:
+               stack.append(node)
+               node = node.right
+         while stack:
+            node = stack.pop()
+            if lo is not None and (node.sortKey < lo if loInclusive else
+                                   not lo < node.sortKey):
+               return
+            yield (node.key, node.value)
+            node = node.left
+            while node is not None:
+               stack.append(node)
+               node = node.right
+
+   # This method prints a tree sideways with 1 node on each line,
+   # indents each level by some blanks, and starts at the root node
+   # with no indent
+   #####################################################################
+   def print(self, indentBy=7):
+      self.__pTree(self.__root, "", indentBy)
+
+   # This method recursively prints a subtree sideways, increasing the
+   # indent level for subtrees
+   #####################################################################
+   def __pTree(self, node, indent, indentBy=7):
+
+      # Only print if there is a node
+      if node:
+         self.__pTree(node.right, indent + " " * indentBy, indentBy)
+         print(indent, node, '(', node.height, node.heightDiff(), ')')
+         self.__pTree(node.left, indent + " " * indentBy, indentBy)
+
+   # This method shows the tree in string form as key-value pairs
+   # surrounded in curly braces
+   #####################################################################
+   def __str__(self):
+      return '{{{}}}'.format(', '.join('{}: {}'.format(repr(key), repr(value))
+                   for key, value in self.traverse('pre')))
@@ -0,0 +1,74 @@
+#################################################################
+# StackBenchmark.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This program times the link stack against the deque stack on
+# the operations a work queue uses: push, pop, peek, and len. The
+# link stack keeps a running count so len() isn't a full walk.
+# Run it with an optional item count, for example:
+#    python StackBenchmark.py 100000
+#################################################################
+
+from LinkStack import *
+import sys
+import timeit
+
+def main():
+   count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+   repeats = 5
+
+   print(f"Timing {count} items per run, best of {repeats} runs")
+   print(f"{'operation':<12}{'Stack':>12}{'DequeStack':>14}{'speedup':>10}")
+
+   for name, function in (('push', pushAll), ('pop', pushPopAll),
+                          ('peek', pushPeekAll), ('len', pushLenAll)):
+      linkTime = bestTime(function, lambda: Stack(countLength=True), count,
+                          repeats)
+      dequeTime = bestTime(function, DequeStack, count, repeats)
+      print(f"{name:<12}{linkTime:>11.4f}s{dequeTime:>13.4f}s"
+            f"{linkTime / dequeTime:>9.1f}x")
+
+# This function returns the best time of several runs of a benchmark
+# function on a new stack from makeStack
+#########################################################################
+def bestTime(function, makeStack, count, repeats):
+   return min(timeit.repeat(lambda: function(makeStack(), count),
+                            number=1, repeat=repeats))
+
+# This function pushes count items
+#########################################################################
+def pushAll(stack, count):
+   push = stack.push
+   for i in range(count):
+      push(i)
+
+# This function pushes count items and pops them all again
+#########################################################################
+def pushPopAll(stack, count):
+   pushAll(stack, count)
+   pop = stack.pop
+   for i in range(count):
+      pop()
+
+# This function pushes count items, peeking after each push
+#########################################################################
+def pushPeekAll(stack, count):
+   push, peek = stack.push, stack.peek
+   for i in range(count):
+      push(i)
+      peek()
+
+# This function pushes count items, asking for the length after each
+#########################################################################
+def pushLenAll(stack, count):
+   push = stack.push
+   for i in range(count):
+      push(i)
+      len(stack)
+
+# execute main function
+if __name__ == '__main__':
+   main()
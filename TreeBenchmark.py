@@ -0,0 +1,310 @@
+#################################################################
+# TreeBenchmark.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# This program measures the AVL tree, the binary search tree, and
+# the indexed linked list. It times insert, search, delete, and
+# traverse on each, plus the balance checks on the trees, for
+# sequential, reversed, random, and zipfian inputs. It reports
+# operations per second, p50 and p99 latency, and the peak memory
+# used to build each structure. Results can be saved as JSON and
+# compared against a saved baseline, for example:
+#    python TreeBenchmark.py --sizes 1e3 1e5 --output new.json
+#    python TreeBenchmark.py --sizes 1e3 1e5 --baseline old.json
+#################################################################
+
+from AVLtree import *
+from BinarySearchTree import *
+from LinkedList import *
+from itertools import accumulate
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+STRUCTURES = ['AVLtree', 'BinarySearchTree', 'LinkedList']
+DISTRIBUTIONS = ['sequential', 'reversed', 'random', 'zipfian']
+
+def main(argv=None):
+   parser = argparse.ArgumentParser(
+      description="Benchmark the AVL tree, binary search tree, and linked list")
+   parser.add_argument('--sizes', nargs='+', type=lambda size: int(float(size)),
+                       default=[1000, 10000],
+                       help="item counts to run, such as 1e3 1e5 (default: "
+                       "1e3 1e4)")
+   parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS,
+                       default=DISTRIBUTIONS)
+   parser.add_argument('--structures', nargs='+', choices=STRUCTURES,
+                       default=STRUCTURES)
+   parser.add_argument('--seed', type=int, default=1,
+                       help="random seed for the inputs (default: 1)")
+   parser.add_argument('--repeat', type=int, default=1,
+                       help="runs of each case, keeping the fastest "
+                       "(default: 1)")
+   parser.add_argument('--zipf', type=float, default=1.1,
+                       help="zipfian skew exponent (default: 1.1)")
+   parser.add_argument('--samples', type=int, default=100000,
+                       help="most operations timed one by one for "
+                       "latencies in each case (default: 100000)")
+   parser.add_argument('--degenerate-limit', type=int, default=5000,
+                       help="largest size to run the binary search tree on "
+                       "sequential or reversed input, which makes it a "
+                       "linked list (default: 5000)")
+   parser.add_argument('--no-memory', action='store_true',
+                       help="skip the extra build that measures peak memory")
+   parser.add_argument('--output', help="file to write JSON results to")
+   parser.add_argument('--baseline', help="JSON results to compare against")
+   parser.add_argument('--tolerance', type=float, default=0.10,
+                       help="slowdown fraction reported as a regression "
+                       "(default: 0.10)")
+   args = parser.parse_args(argv)
+
+   results = []
+   print(f"{'structure':<18}{'input':<12}{'size':>10}  {'operation':<20}"
+         f"{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}")
+   for size in args.sizes:
+      for distribution in args.distributions:
+         values, queries = makeInputs(distribution, size, args.zipf,
+                                      random.Random(args.seed))
+         for structure in args.structures:
+            if (structure == 'BinarySearchTree' and size > args.degenerate_limit
+                and distribution in ('sequential', 'reversed')):
+               print(f"{structure:<18}{distribution:<12}{size:>10}  skipped, "
+                     f"degenerate above {args.degenerate_limit}")
+               continue
+            caseResults = benchmarkCase(structure, values, queries,
+                                        args.repeat, args.samples)
+            if not args.no_memory:
+               caseResults.append(measureMemory(structure, values))
+            for result in caseResults:
+               result.update(structure=structure, distribution=distribution,
+                             size=size)
+               printResult(result)
+            results.append(caseResults)
+
+   report = {'python': platform.python_version(),
+             'platform': platform.platform(),
+             'arguments': ' '.join(sys.argv[1:] if argv is None else argv),
+             'seed': args.seed,
+             'results': [result for caseResults in results
+                         for result in caseResults]}
+   if args.output:
+      with open(args.output, 'w') as file:
+         json.dump(report, file, indent=1)
+   if args.baseline:
+      with open(args.baseline) as file:
+         baseline = json.load(file)
+      if compareResults(baseline['results'], report['results'],
+                        args.tolerance):
+         return 1
+   return 0
+
+# This function returns the values to insert and the values to search
+# for. Sequential, reversed, and random inputs insert each of 0 to
+# size - 1 once and search for them in the same order. Zipfian inputs
+# draw both from a skewed distribution, so a few hot values repeat
+# often and many values never appear
+#########################################################################
+def makeInputs(distribution, size, skew, rand):
+   if distribution == 'sequential':
+      values = list(range(size))
+   elif distribution == 'reversed':
+      values = list(range(size - 1, -1, -1))
+   elif distribution == 'random':
+      values = list(range(size))
+      rand.shuffle(values)
+   else:
+      # Give the ranks random values so the hot values are scattered
+      ranked = list(range(size))
+      rand.shuffle(ranked)
+      weights = list(accumulate(1 / rank ** skew for rank in range(1, size + 1)))
+      values = rand.choices(ranked, cum_weights=weights, k=size)
+      return values, rand.choices(ranked, cum_weights=weights, k=size)
+   return values, values
+
+# This function returns the operations to time on a new empty structure:
+# a dictionary of functions applied once per value, a function that
+# traverses all items and returns their count, and a dictionary of
+# balance checks
+#########################################################################
+def operationsFor(structure):
+   if structure == 'AVLtree':
+      tree = AVLtree()
+      return ({'insert': lambda value: tree.insert(value, value),
+               'search': tree.search, 'delete': tree.delete},
+              lambda: countItems(tree.traverse()),
+              {'isBalanced': tree.isBalanced, 'validate': tree.validate})
+   if structure == 'BinarySearchTree':
+      tree = BinarySearchTree()
+      return ({'insert': lambda value: tree.insert(value, value),
+               'search': tree.search, 'delete': tree.delete},
+              lambda: countItems(tree.traverse()),
+              {'balanceTrueOrFalse': tree.balanceTrueOrFalse,
+               'unbalancedNodes': tree.unbalancedNodes})
+
+   # The linked list is indexed by value, so it is given each value once
+   linkedList = LinkedList(key=lambda value: value)
+   def traverse():
+      items = []
+      linkedList.traverse(items.append)
+      return len(items)
+   return ({'insert': linkedList.insert, 'search': linkedList.search,
+            'delete': linkedList.delete},
+           traverse, {})
+
+# This function returns an iterator's item count
+#########################################################################
+def countItems(iterator):
+   count = 0
+   for item in iterator:
+      count += 1
+   return count
+
+# This function times every operation on one structure with one input,
+# keeping the fastest of several runs, and returns a list of results
+#########################################################################
+def benchmarkCase(structure, values, queries, repeat, samples):
+   deletes = list(dict.fromkeys(values))   # Each inserted value once
+   inserts = deletes if structure == 'LinkedList' else values
+   best = {}
+   for run in range(repeat):
+      operations, traverse, checks = operationsFor(structure)
+      timings = [timeOperations('insert', operations['insert'], inserts,
+                                samples),
+                 timeOperations('search', operations['search'], queries,
+                                samples)]
+
+      # Time a traversal in items per second, and each balance check in
+      # calls per second since some checks stop at the first problem
+      start = time.perf_counter_ns()
+      count = traverse()
+      timings.append(makeResult('traverse', count,
+                                time.perf_counter_ns() - start, []))
+      for name, check in checks.items():
+         start = time.perf_counter_ns()
+         check()
+         timings.append(makeResult(name, 1,
+                                   time.perf_counter_ns() - start, []))
+
+      timings.append(timeOperations('delete', operations['delete'], deletes,
+                                    samples))
+      for result in timings:
+         name = result['operation']
+         if name not in best or result['seconds'] < best[name]['seconds']:
+            best[name] = result
+   return list(best.values())
+
+# This function applies an operation to each argument and returns its
+# result. At most samples of the calls, spread evenly, are also timed
+# one by one for the latency percentiles
+#########################################################################
+def timeOperations(name, operation, arguments, samples):
+   sampleEvery = max(1, len(arguments) // samples)
+   clock = time.perf_counter_ns
+   latencies = []
+   start = clock()
+   for i, argument in enumerate(arguments):
+      if i % sampleEvery:
+         operation(argument)
+      else:
+         before = clock()
+         operation(argument)
+         latencies.append(clock() - before)
+   return makeResult(name, len(arguments), clock() - start, latencies)
+
+# This function makes a result from an operation count, the total time
+# in nanoseconds, and any sampled latencies in nanoseconds
+#########################################################################
+def makeResult(name, count, elapsed, latencies):
+   seconds = elapsed / 1e9
+   result = {'operation': name, 'count': count, 'seconds': seconds,
+             'opsPerSec': count / seconds if seconds else None,
+             'p50Ns': None, 'p99Ns': None}
+   if latencies:
+      latencies.sort()
+      result['p50Ns'] = latencies[len(latencies) // 2]
+      result['p99Ns'] = latencies[min(len(latencies) - 1,
+                                      len(latencies) * 99 // 100)]
+   return result
+
+# This function builds a structure while tracing memory and returns a
+# result with the peak number of bytes allocated
+#########################################################################
+def measureMemory(structure, values):
+   unique = list(dict.fromkeys(values))
+   if structure == 'LinkedList':
+      values = unique
+   tracemalloc.start()
+   try:
+      operations, traverse, checks = operationsFor(structure)
+      insert = operations['insert']
+      for value in values:
+         insert(value)
+      peak = tracemalloc.get_traced_memory()[1]
+   finally:
+      tracemalloc.stop()
+   return {'operation': 'memory', 'count': len(unique), 'peakBytes': peak,
+           'bytesPerItem': peak / len(unique) if unique else None}
+
+# This function prints one result as a table row
+#########################################################################
+def printResult(result):
+   row = (f"{result['structure']:<18}{result['distribution']:<12}"
+          f"{result['size']:>10}  {result['operation']:<20}")
+   if result['operation'] == 'memory':
+      print(row + f"{result['peakBytes'] / 2**20:>11.1f}M peak, "
+            f"{result['bytesPerItem'] or 0:.0f} bytes per item")
+      return
+   opsPerSec = result['opsPerSec']
+   row += f"{opsPerSec:>12.0f}" if opsPerSec else f"{'-':>12}"
+   for field in ('p50Ns', 'p99Ns'):
+      row += (f"{result[field] / 1000:>10.2f}" if result[field] is not None
+              else f"{'-':>10}")
+   print(row)
+
+# This function compares results against a baseline run, printing the
+# change in speed (or in peak memory) for each result they share. It
+# returns the number of changes worse than the tolerance allows
+#########################################################################
+def compareResults(baseline, results, tolerance):
+   def caseOf(result):
+      return (result['structure'], result['distribution'], result['size'],
+              result['operation'])
+   old = {caseOf(result): result for result in baseline}
+
+   print(f"\n{'structure':<18}{'input':<12}{'size':>10}  {'operation':<20}"
+         f"{'baseline':>12}{'now':>12}{'change':>9}")
+   regressions = 0
+   for result in results:
+      before = old.get(caseOf(result))
+      if before is None:
+         continue
+
+      # Compare speed, or memory where lower is better
+      if result['operation'] == 'memory':
+         oldValue, newValue = before['peakBytes'], result['peakBytes']
+         ratio = oldValue / newValue if newValue else 1.0
+      else:
+         oldValue, newValue = before['opsPerSec'], result['opsPerSec']
+         if not oldValue or not newValue:
+            continue
+         ratio = newValue / oldValue
+      worse = ratio < 1 - tolerance
+      regressions += worse
+      print(f"{result['structure']:<18}{result['distribution']:<12}"
+            f"{result['size']:>10}  {result['operation']:<20}"
+            f"{oldValue:>12.0f}{newValue:>12.0f}{(ratio - 1) * 100:>+8.1f}%"
+            + ("  REGRESSION" if worse else ""))
+   print(f"{regressions} regression{'' if regressions == 1 else 's'} beyond "
+         f"{tolerance:.0%}")
+   return regressions
+
+# execute main function
+if __name__ == '__main__':
+   sys.exit(main())
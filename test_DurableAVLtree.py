@@ -0,0 +1,208 @@
+#################################################################
+# test_DurableAVLtree.py
+#################################################################
+# Author: gametechmatch
+# Course: Data Structures
+# Programming Project 10.1
+#################################################################
+# These tests check that a durable AVL tree keeps its log and its
+# items in step: items that can't be logged are refused, a torn
+# record at the end of the log is cut off, and a tree reopened
+# after compaction matches the one that was closed.
+#################################################################
+
+from DurableAVLtree import *
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+# A log file whose next write raises OSError, as a full disk would
+#################################################################
+class FailingFile(object):
+
+   def __init__(self, file):
+      self.file = file
+      self.failNext = True
+
+   def write(self, data):
+      if self.failNext:
+         self.failNext = False
+         raise OSError("No space left on device")
+      return self.file.write(data)
+
+   def __getattr__(self, name):
+      return getattr(self.file, name)
+
+class DurableAVLtreeTest(unittest.TestCase):
+
+   def setUp(self):
+      self.directory = tempfile.mkdtemp()
+
+   def tearDown(self):
+      shutil.rmtree(self.directory)
+
+   # This method opens the tree in the test directory
+   #################################################################
+   def open(self, **options):
+      options.setdefault('fsync', False)
+      return DurableAVLtree(self.directory, **options)
+
+   # This method returns the path of the newest log segment
+   #################################################################
+   def lastSegment(self):
+      segments = sorted(name for name in os.listdir(self.directory)
+                        if name.startswith('wal-'))
+      return os.path.join(self.directory, segments[-1])
+
+   def test_unencodable_insert_changes_nothing(self):
+      tree = self.open()
+      tree.insert('a', 1)
+      lock = threading.Lock()
+      with self.assertRaises(TypeError):
+         tree.insert(lock, 2)
+      self.assertIsNone(tree.search(2))
+      self.assertEqual(len(tree), 1)
+
+      # The store keeps working, through compaction too
+      self.assertTrue(tree.insert('c', 3))
+      tree.compact()
+      self.assertTrue(tree.delete(1))
+      tree.close()
+
+      tree = self.open()
+      self.assertEqual(tree.traverse(), [('c', 3)])
+      tree.close()
+
+   def test_unencodable_delete_changes_nothing(self):
+      tree = self.open()
+      tree.insert('a', 1)
+      with self.assertRaises(TypeError):
+         tree.delete(threading.Lock())
+      self.assertEqual(tree.traverse(), [('a', 1)])
+      tree.close()
+
+   def test_failed_write_refuses_later_changes(self):
+      tree = self.open()
+      tree.insert('a', 1)
+      tree.flush()
+      tree._DurableAVLtree__file = FailingFile(tree._DurableAVLtree__file)
+      with self.assertRaises(OSError):
+         tree.insert('b', 2)
+
+      # The log lost 'b', so nothing more may be logged after it
+      with self.assertRaises(OSError):
+         tree.insert('c', 3)
+      with self.assertRaises(OSError):
+         tree.flush()
+      tree.close()
+
+      tree = self.open()
+      self.assertEqual(tree.traverse(), [('a', 1)])
+      tree.insert('c', 3)
+      tree.close()
+      tree = self.open()
+      self.assertEqual(tree.traverse(), [('a', 1), ('c', 3)])
+      tree.close()
+
+   def test_torn_tail_is_cut_off(self):
+      tree = self.open()
+      for value in range(10):
+         tree.insert(str(value), value)
+      tree.close()
+
+      # Cut the last record short, as a crash in the middle of a write
+      # would
+      path = self.lastSegment()
+      size = os.path.getsize(path)
+      with open(path, 'r+b') as file:
+         file.truncate(size - 3)
+
+      tree = self.open()
+      self.assertEqual(tree.traverse(), [(str(value), value)
+                                         for value in range(9)])
+      tree.insert('x', 100)
+      tree.close()
+      self.assertLess(os.path.getsize(path), size - 3)
+
+      # The cut segment is no longer the last, and still replays
+      tree = self.open()
+      self.assertEqual(len(tree), 10)
+      self.assertEqual(tree.search(100), 'x')
+      tree.close()
+
+   def test_bad_checksum_at_tail_is_cut_off(self):
+      tree = self.open()
+      tree.insert('a', 1)
+      tree.insert('b', 2)
+      tree.close()
+      path = self.lastSegment()
+      with open(path, 'r+b') as file:
+         file.seek(-1, os.SEEK_END)
+         last = file.read(1)
+         file.seek(-1, os.SEEK_END)
+         file.write(bytes([last[0] ^ 0xff]))
+
+      tree = self.open()
+      self.assertEqual(tree.traverse(), [('a', 1)])
+      tree.close()
+
+   def test_damage_before_the_last_segment_raises(self):
+      tree = self.open()
+      tree.insert('a', 1)
+      tree.insert('b', 2)
+      tree.close()
+      path = self.lastSegment()
+      self.open().close()   # Starts a newer segment
+      with open(path, 'r+b') as file:
+         file.truncate(os.path.getsize(path) - 1)
+      with self.assertRaises(ValueError):
+         self.open()
+
+   def test_replay_after_compaction(self):
+      tree = self.open(compactBytes=1 << 30)
+      expected = {}
+      for value in range(200):
+         tree.insert(str(value), value)
+         expected[value] = str(value)
+      tree.compact()
+      for value in range(0, 200, 3):
+         tree.delete(value)
+         del expected[value]
+      for value in range(150, 250):
+         tree.insert('new' + str(value), value)
+         expected[value] = 'new' + str(value)
+      tree.close()
+
+      names = os.listdir(self.directory)
+      self.assertEqual(len([name for name in names
+                            if name.startswith('snapshot-')]), 1)
+
+      tree = self.open()
+      self.assertEqual(tree.traverse(),
+                       [(expected[value], value) for value in sorted(expected)])
+      tree.close()
+
+   def test_background_compaction(self):
+      tree = self.open(compactBytes=2000, syncInterval=0.01)
+      for value in range(500):
+         tree.insert(value, value)
+
+      # Give the background thread a few seconds to compact
+      for tries in range(500):
+         if any(name.startswith('snapshot-')
+                for name in os.listdir(self.directory)):
+            break
+         time.sleep(0.01)
+      else:
+         self.fail("Log was not compacted in the background")
+      tree.close()
+
+      tree = self.open()
+      self.assertEqual(len(tree), 500)
+      tree.close()
+
+if __name__ == '__main__':
+   unittest.main()